@@ -0,0 +1,22 @@
+from django.apps import AppConfig
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+
+
+class AccountsConfig(AppConfig):
+    name = "accounts"
+
+    def ready(self):
+        from middleware.jwt_websocket import invalidate_cached_profile, invalidate_cached_user
+
+        from .models import UserProfile
+
+        # Users cached by the WebSocket JWT middleware (their profile is
+        # cached with them)
+        for model, receiver in (
+            (get_user_model(), invalidate_cached_user),
+            (UserProfile, invalidate_cached_profile),
+        ):
+            uid = f"ws-auth-{model.__name__}"
+            post_save.connect(receiver, sender=model, dispatch_uid=uid)
+            post_delete.connect(receiver, sender=model, dispatch_uid=uid)
@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from middleware.jwt_websocket import user_cache
+
+from .models import UserProfile
+
+
+class WebSocketUserCacheInvalidationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("cached", password="pw")
+        self.profile = UserProfile.objects.create(user=self.user)
+        self.addCleanup(user_cache.clear)
+
+    def cache_user(self):
+        user_cache.set(str(self.user.pk), self.user)
+        self.assertIsNotNone(user_cache.get(str(self.user.pk)))
+
+    def test_saving_the_user_evicts_it(self):
+        self.cache_user()
+        self.user.save()
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
+
+    def test_saving_or_deleting_the_profile_evicts_the_user(self):
+        self.cache_user()
+        self.profile.tier = "pro"
+        self.profile.save()
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
+
+        self.cache_user()
+        self.profile.delete()
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class ExercisesConfig(AppConfig):
+    name = "exercises"
+
+    def ready(self):
+        from .catalog import invalidate_catalog
+        from .models import Exercise, ExerciseCategory
+
+        # Category names are part of the cached catalog too
+        for model in (Exercise, ExerciseCategory):
+            uid = f"exercise-catalog-{model.__name__}"
+            post_save.connect(invalidate_catalog, sender=model, dispatch_uid=uid)
+            post_delete.connect(invalidate_catalog, sender=model, dispatch_uid=uid)
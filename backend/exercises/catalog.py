@@ -0,0 +1,52 @@
+"""
+In-process cache of the free exercise catalog.
+
+The catalog is small and rarely changes, so each process keeps it in memory,
+grouped by target issue, and reloads it only when its version stamp in
+posture_project.cache_versions moves (Exercise / ExerciseCategory saves and
+deletes bump it; see apps.py).
+"""
+
+import threading
+
+from posture_project import cache_versions
+
+from .models import Exercise
+
+CATALOG_VERSION = "exercise_catalog"
+
+
+class ExerciseCatalog:
+    """Non-premium exercises by target issue, ordered by difficulty then name."""
+
+    def __init__(self, exercises, version):
+        self.version = version
+        self.by_target = {}
+        for exercise in sorted(exercises, key=lambda e: (e.difficulty, e.name)):
+            self.by_target.setdefault(exercise.target_issue, []).append(exercise)
+
+    def for_target(self, target_issue):
+        return self.by_target.get(target_issue, [])
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """Return the current catalog, reloading it if it has been invalidated."""
+    global _catalog
+    version = cache_versions.get_version(CATALOG_VERSION)
+    catalog = _catalog
+    if catalog is not None and catalog.version == version:
+        return catalog
+    with _catalog_lock:
+        if _catalog is None or _catalog.version != version:
+            exercises = Exercise.objects.filter(is_premium=False).select_related("category")
+            _catalog = ExerciseCatalog(list(exercises), version)
+        return _catalog
+
+
+def invalidate_catalog(**kwargs):
+    """Signal receiver: the catalog changed, so every process must reload it."""
+    cache_versions.bump(CATALOG_VERSION)
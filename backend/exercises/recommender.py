@@ -1,8 +1,7 @@
-from django.db.models import Avg
+from posture.models import UserPostureSummary
+from posture.summaries import rebuild_summary
 
-from posture.models import PostureScore, PostureSession
-
-from .models import Exercise
+from .catalog import get_catalog
 
 # Maps scoring components to Exercise.target_issue values
 COMPONENT_TO_TARGET = {
@@ -16,26 +15,24 @@ COMPONENT_TO_TARGET = {
 WEAK_THRESHOLD = 70
 
 
-def get_weak_components(user, max_sessions=5):
+def get_weak_components(user):
     """
-    Analyze the user's recent sessions and return a list of
-    (component_field, avg_score) tuples sorted weakest-first.
+    Return the user's weak components as (component_field, avg_score)
+    tuples sorted weakest-first, based on their recent sessions.
+
+    Reads the user's UserPostureSummary, which is kept up to date as
+    sessions end; it is built on first use for users who don't have one
+    yet (``manage.py backfill_posture_summaries`` does this in bulk).
     """
-    recent_sessions = (
-        PostureSession.objects.filter(user=user, is_active=False)
-        .order_by("-started_at")[:max_sessions]
-        .values_list("id", flat=True)
+    averages = (
+        UserPostureSummary.objects.filter(user=user)
+        .values_list("component_averages", flat=True)
+        .first()
     )
+    if averages is None:
+        averages = rebuild_summary(user).component_averages
 
-    if not recent_sessions:
-        return []
-
-    avgs = PostureScore.objects.filter(session_id__in=list(recent_sessions)).aggregate(
-        head_position_score=Avg("head_position_score"),
-        shoulder_levelness_score=Avg("shoulder_levelness_score"),
-        shoulder_rounding_score=Avg("shoulder_rounding_score"),
-        spine_alignment_score=Avg("spine_alignment_score"),
-    )
+    avgs = {f"{component}_score": avg for component, avg in averages.items()}
 
     weak = []
     for component, avg in avgs.items():
@@ -49,16 +46,17 @@ def get_weak_components(user, max_sessions=5):
 
 def recommend_exercises(user, limit=6):
     """
-    Return a queryset of exercises targeted at the user's weakest posture
+    Return a list of exercises targeted at the user's weakest posture
     components. Falls back to general exercises if no weak areas detected.
     """
-    weak = get_weak_components(user)
+    return select_exercises(get_weak_components(user), get_catalog(), limit)
+
 
+def select_exercises(weak, catalog, limit):
+    """Pick exercises for ``weak`` components from an ExerciseCatalog (no queries)."""
     if not weak:
         # No data or everything is fine — return general exercises
-        return Exercise.objects.filter(
-            target_issue="general", is_premium=False
-        ).order_by("difficulty", "name")[:limit]
+        return catalog.for_target("general")[:limit]
 
     # Collect target issues from weak components, ordered by severity
     target_issues = []
@@ -68,31 +66,19 @@ def recommend_exercises(user, limit=6):
             target_issues.append(target)
 
     # Allocate exercise slots proportionally: more for weaker components
-    # At minimum 1 per weak area, rest go to the weakest
+    # At minimum 1 per weak area, rest go to the weakest. Each exercise has
+    # a single target issue, so the per-target lists never overlap.
     exercises = []
-    seen_ids = set()
     per_issue = max(1, limit // len(target_issues))
 
     for target in target_issues:
-        qs = (
-            Exercise.objects.filter(target_issue=target, is_premium=False)
-            .exclude(id__in=seen_ids)
-            .order_by("difficulty", "name")[:per_issue]
-        )
-        for ex in qs:
+        for ex in catalog.for_target(target)[:per_issue]:
             if len(exercises) >= limit:
                 break
             exercises.append(ex)
-            seen_ids.add(ex.id)
 
     # If we still have room, pad with general exercises
     if len(exercises) < limit:
-        remaining = limit - len(exercises)
-        general = (
-            Exercise.objects.filter(target_issue="general", is_premium=False)
-            .exclude(id__in=seen_ids)
-            .order_by("difficulty", "name")[:remaining]
-        )
-        exercises.extend(general)
+        exercises.extend(catalog.for_target("general")[:limit - len(exercises)])
 
     return exercises
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from posture_project.row_serializers import RowSerializer
+
 from .models import Exercise, ExerciseCategory, UserExerciseLog
 
 
@@ -31,6 +33,15 @@ class ExerciseSerializer(serializers.ModelSerializer):
         ]
 
 
+class ExerciseRowSerializer(RowSerializer):
+    """Fast path for ExerciseSerializer; same JSON."""
+
+    fields = ExerciseSerializer.Meta.fields
+    sources = {"category_name": "category__name"}
+    # DRF leaves category_name out entirely for uncategorised exercises
+    omit_if_none = ("category_name",)
+
+
 class UserExerciseLogSerializer(serializers.ModelSerializer):
     exercise_name = serializers.CharField(source="exercise.name", read_only=True)
 
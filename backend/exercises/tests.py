@@ -0,0 +1,98 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from posture.models import UserPostureSummary
+
+from .catalog import get_catalog
+from .models import Exercise, ExerciseCategory
+
+
+class ExerciseCatalogQueryTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("catalog", password="pw")
+        UserPostureSummary.objects.create(
+            user=cls.user,
+            component_averages={"head_position": 55.0, "shoulder_rounding": 62.0},
+        )
+        category = ExerciseCategory.objects.create(name="Stretching")
+        for target in ("forward_head", "shoulder_round", "general"):
+            for difficulty in ("beginner", "intermediate"):
+                Exercise.objects.create(
+                    name=f"{target} {difficulty}",
+                    description="-",
+                    instructions="-",
+                    category=category,
+                    target_issue=target,
+                    difficulty=difficulty,
+                    duration_seconds=30,
+                )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_warm_recommendations_query_only_the_summary(self):
+        url = reverse("exercise-recommended")
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [e["target_issue"] for e in response.data][:2], ["forward_head", "forward_head"],
+        )
+
+    def test_warm_list_is_served_from_cache(self):
+        url = reverse("exercise-list")
+        self.client.get(url, {"target_issue": "general"})
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {"target_issue": "general"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_saving_an_exercise_invalidates_the_catalog(self):
+        catalog = get_catalog()
+        self.assertIs(get_catalog(), catalog)
+
+        exercise = Exercise.objects.get(name="general beginner")
+        exercise.name = "general renamed"
+        exercise.save()
+
+        reloaded = get_catalog()
+        self.assertIsNot(reloaded, catalog)
+        self.assertIn("general renamed", [e.name for e in reloaded.for_target("general")])
+
+
+class ExerciseConditionalRequestTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("conditional", password="pw")
+        cls.exercise = Exercise.objects.create(
+            name="Chin tuck",
+            description="-",
+            instructions="-",
+            target_issue="forward_head",
+            duration_seconds=30,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("exercise-list")
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since_alone_never_hides_a_change(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        # Usually within the same second as the first response
+        self.exercise.name = "Chin tuck (seated)"
+        self.exercise.save()
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["name"], "Chin tuck (seated)")
@@ -1,13 +1,20 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 
+from posture_project.http_cache import CachedResponseMixin
+from posture_project.row_serializers import RowListMixin
+
+from .catalog import CATALOG_VERSION
 from .models import Exercise, UserExerciseLog
 from .recommender import recommend_exercises
-from .serializers import ExerciseSerializer, UserExerciseLogSerializer
+from .serializers import ExerciseRowSerializer, ExerciseSerializer, UserExerciseLogSerializer
 
 
-class ExerciseListView(generics.ListAPIView):
+class ExerciseListView(CachedResponseMixin, RowListMixin, generics.ListAPIView):
+    cache_version = CATALOG_VERSION
+    cache_control = "private, no-cache"
     serializer_class = ExerciseSerializer
+    row_serializer_class = ExerciseRowSerializer
 
     def get_queryset(self):
         qs = Exercise.objects.select_related("category").all()
@@ -23,7 +30,9 @@ class ExerciseListView(generics.ListAPIView):
         return qs
 
 
-class ExerciseDetailView(generics.RetrieveAPIView):
+class ExerciseDetailView(CachedResponseMixin, generics.RetrieveAPIView):
+    cache_version = CATALOG_VERSION
+    cache_control = "private, no-cache"
     serializer_class = ExerciseSerializer
     queryset = Exercise.objects.select_related("category").all()
 
@@ -1,21 +1,113 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
 from urllib.parse import parse_qs
 
 from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import AccessToken
 
+from posture_project import metrics
+
 User = get_user_model()
 
 
+class UserCache:
+    """
+    Size-bounded, short-TTL cache of users by id, so reconnect storms do not
+    turn into one user query per connection. Entries are evicted when the
+    user or their profile is saved or deleted in this process; changes made
+    by other processes are picked up when the entry expires.
+
+    Keys are user ids as strings, since that is how SimpleJWT puts them in
+    the token's user id claim.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Each connection gets its own copy of the cached snapshot
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.WS_AUTH_CACHE_SIZE, settings.WS_AUTH_CACHE_TTL)
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Signal receiver for User saves and deletes (connected in accounts.apps)."""
+    user_cache.invalidate(str(instance.pk))
+
+
+def invalidate_cached_profile(sender, instance, **kwargs):
+    """Signal receiver for UserProfile saves and deletes (connected in accounts.apps)."""
+    user_cache.invalidate(str(instance.user_id))
+
+
 @database_sync_to_async
-def get_user_from_token(token_str):
+def _load_user(user_id):
+    try:
+        return User.objects.select_related("profile").get(id=user_id)
+    except User.DoesNotExist:
+        return None
+
+
+async def get_user_from_token(token_str):
+    # Signature and expiry are checked without touching the database
     try:
-        token = AccessToken(token_str)
-        return User.objects.get(id=token["user_id"])
-    except Exception:
+        user_id = str(AccessToken(token_str)[jwt_settings.USER_ID_CLAIM])
+    except (TokenError, KeyError):
+        metrics.incr("ws_auth.invalid_tokens")
+        return AnonymousUser()
+
+    user = user_cache.get(user_id)
+    if user is None:
+        metrics.incr("ws_auth.cache_misses")
+        user = await _load_user(user_id)
+        if user is None:
+            return AnonymousUser()
+        user_cache.set(user_id, user)
+    else:
+        metrics.incr("ws_auth.cache_hits")
+
+    if not user.is_active:
         return AnonymousUser()
+    return user
 
 
 class JWTWebSocketMiddleware(BaseMiddleware):
@@ -25,7 +117,9 @@ class JWTWebSocketMiddleware(BaseMiddleware):
         token_list = params.get("token", [])
 
         if token_list:
+            start = time.perf_counter()
             scope["user"] = await get_user_from_token(token_list[0])
+            metrics.observe("ws_auth.latency", time.perf_counter() - start)
         else:
             scope["user"] = AnonymousUser()
 
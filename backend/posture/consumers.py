@@ -1,18 +1,28 @@
 import asyncio
 import logging
+import time
 
+import numpy as np
+from channels.consumer import AsyncConsumer
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
 from django.utils import timezone
 
-from .landmark_utils import (
-    create_pose_detector,
-    decode_frame,
-    extract_landmarks,
-    serialize_posture_landmarks,
-)
-from .models import PostureScore, PostureSession
-from .scoring import PostureScorer
+from .frame_mailbox import FrameMailbox, PendingFrame
+from .frame_protocol import BINARY_SUBPROTOCOL, FrameProtocolError, parse_binary_frame
+from .inference import InferenceBusy, get_inference_backend, get_preprocessing, process_frame
+from .landmark_utils import serialize_posture_landmarks
+from posture_project import metrics
+
+from .models import PostureScore, PostureSeries, PostureSession
+from .rate_control import RateController, node_load
+from .scene_change import SceneChangeGate, frame_thumbnail
+from .score_buffer import get_score_buffer
+from .scoring import CalibrationBaseline, PostureScorer
+from .series import SeriesRecorder, build_rollups, decode_series
+from .session_stats import SessionStats
+from .summaries import record_daily, record_session
 
 logger = logging.getLogger(__name__)
 
@@ -29,18 +39,46 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
     Protocol:
         Client sends:
             {"action": "start_session"}
+            {"action": "start_session", "reuse_calibration": true}
             {"action": "calibrate"}           — begin 3s calibration
             {"action": "frame", "frame": "<base64 JPEG>"}
+            <binary message: JPEG bytes>      — see frame_protocol
             {"action": "end_session"}
 
         Server responds:
-            {"type": "session_started", "session_id": ...}
+            {"type": "session_started", "session_id": ..., "ideal_landmarks"?: {...}}
             {"type": "calibration_started"}
             {"type": "calibration_progress", "progress": 0.0-1.0}
             {"type": "calibration_complete"}
             {"type": "posture_result", "score": ..., "details": {...}, ...}
+            {"type": "frame_skipped", "reason": "busy"}
+            {"type": "rate_control", "fps": ..., "jpeg_quality": ..., "max_width": ..., "reason": "..."}
             {"type": "session_ended", "summary": {...}}
             {"type": "error", "message": "..."}
+
+    Binary frames are only accepted when the client offers the
+    ``posture.binary.v1`` subprotocol at connect time.
+
+    Frames are analysed by a background task fed from a latest-frame-wins
+    mailbox, so a slow inference never builds a backlog: stale frames are
+    dropped and each posture_result reports ``dropped_frames`` and
+    ``queue_latency_ms``, plus ``decode_ms``, ``preprocess_ms`` and
+    ``inference_ms`` for the frame itself.
+
+    A rate_control message is sent when a session starts and whenever the
+    session's RateController changes level; the client should capture at
+    that rate, quality and width. The frame loop is throttled to the same
+    rate either way.
+
+    While scoring, frames that barely differ from the last frame inference
+    ran on (see scene_change) reuse its landmarks and score instead; their
+    posture_result carries ``"unchanged": true`` and the session summary
+    counts them as ``frames_unchanged``.
+
+    With ``reuse_calibration`` the new session is scored against the
+    calibration from the user's most recent calibrated session, so there is
+    no need to calibrate again; session_started then carries its
+    ``ideal_landmarks``.
     """
 
     async def connect(self):
@@ -51,21 +89,59 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
 
         self.session = None
         self.scorer = None
-        self.pose_detector = None
+        self.ideal_landmarks = None
+        self.inference = None
         self.calibrating = False
         self.calibration_landmarks = []
         self.frame_count = 0
-        self.score_sum = 0.0
-        self.score_count = 0
+        self.stats = SessionStats()
+        self.mailbox = None
+        self.frame_task = None
+        self.series = None
+        self.rate = None
+        self.scene = None
+        self.last_result = None
+        self.frames_unchanged = 0
+
+        self.binary_frames = BINARY_SUBPROTOCOL in self.scope.get("subprotocols", [])
+        await self.accept(
+            subprotocol=BINARY_SUBPROTOCOL if self.binary_frames else None
+        )
 
-        await self.accept()
+    async def receive(self, text_data=None, bytes_data=None, **kwargs):
+        if bytes_data is not None:
+            await self.receive_bytes(bytes_data)
+        else:
+            await super().receive(text_data=text_data, bytes_data=bytes_data, **kwargs)
+
+    async def receive_bytes(self, bytes_data):
+        try:
+            if not self.binary_frames:
+                raise FrameProtocolError(
+                    f"Binary frames require the {BINARY_SUBPROTOCOL} subprotocol."
+                )
+            seq, payload = parse_binary_frame(bytes_data)
+            await self._handle_frame(payload, seq=seq)
+        except FrameProtocolError as e:
+            await self.send_json({
+                "type": "error",
+                "message": str(e),
+            })
+        except Exception as e:
+            logger.exception("Error processing binary frame")
+            await self.send_json({
+                "type": "error",
+                "message": str(e),
+            })
 
     async def receive_json(self, content):
         action = content.get("action")
 
         try:
             if action == "start_session":
-                await self._handle_start_session()
+                await self._handle_start_session(
+                    reuse_calibration=bool(content.get("reuse_calibration")),
+                )
             elif action == "calibrate":
                 await self._handle_start_calibration()
             elif action == "frame":
@@ -86,15 +162,14 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
 
     async def disconnect(self, code):
         # Clean up: end any active session
+        await self._stop_frame_loop()
         if self.session:
             await self._finalize_session()
-        if self.pose_detector:
-            self.pose_detector.close()
-            self.pose_detector = None
+        await self._close_inference()
 
     # ── Action handlers ─────────────────────────────────────────────
 
-    async def _handle_start_session(self):
+    async def _handle_start_session(self, reuse_calibration=False):
         if self.session:
             await self.send_json({
                 "type": "error",
@@ -102,19 +177,54 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
             })
             return
 
+        try:
+            self.inference = await get_inference_backend().open_session(
+                reply_channel=self.channel_name,
+            )
+        except InferenceBusy:
+            await self.send_json({
+                "type": "error",
+                "message": "Server is busy. Please try again shortly.",
+            })
+            return
+
         self.session = await self._create_session()
-        self.pose_detector = await asyncio.to_thread(create_pose_detector)
         self.scorer = PostureScorer()
+        self.ideal_landmarks = None
+        if reuse_calibration:
+            await self._reuse_last_calibration()
         self.frame_count = 0
-        self.score_sum = 0.0
-        self.score_count = 0
+        self.stats = SessionStats()
         self.calibrating = False
         self.calibration_landmarks = []
+        if settings.POSTURE_SCORE_STORAGE == "series":
+            self.series = SeriesRecorder(self.session.started_at)
+        if settings.POSTURE_RATE_CONTROL:
+            self.rate = RateController(
+                target_latency=settings.POSTURE_RATE_TARGET_LATENCY_MS / 1000,
+                interval=settings.POSTURE_RATE_CONTROL_INTERVAL,
+                high_load=settings.POSTURE_NODE_HIGH_LOAD,
+                low_load=settings.POSTURE_NODE_LOW_LOAD,
+                max_fps=settings.POSTURE_TARGET_FPS,
+            )
+        if settings.POSTURE_SCENE_CHANGE_THRESHOLD > 0:
+            self.scene = SceneChangeGate(
+                threshold=settings.POSTURE_SCENE_CHANGE_THRESHOLD,
+                refresh_interval=settings.POSTURE_SCENE_REFRESH_SECONDS,
+            )
+        self.last_result = None
+        self.frames_unchanged = 0
+        self._start_frame_loop()
 
-        await self.send_json({
+        response = {
             "type": "session_started",
             "session_id": self.session.id,
-        })
+        }
+        if self.ideal_landmarks is not None:
+            response["ideal_landmarks"] = self.ideal_landmarks
+        await self.send_json(response)
+        if self.rate:
+            await self.send_json(self.rate.level.as_message("session_started"))
 
     async def _handle_start_calibration(self):
         if not self.session:
@@ -126,10 +236,14 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
 
         self.calibrating = True
         self.calibration_landmarks = []
+        # Results from before calibration are scored against the old baseline
+        if self.scene:
+            self.scene.reset()
+        self.last_result = None
 
         await self.send_json({"type": "calibration_started"})
 
-    async def _handle_frame(self, frame_data):
+    async def _handle_frame(self, frame_data, seq=None):
         if not self.session:
             await self.send_json({
                 "type": "error",
@@ -140,21 +254,141 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
         if not frame_data:
             return
 
-        # Decode and extract landmarks in a thread (CPU-bound)
-        landmarks = await asyncio.to_thread(
-            self._process_frame_sync, frame_data
-        )
+        self.mailbox.put(PendingFrame(frame_data, seq))
 
-        if landmarks is None:
+    async def _handle_end_session(self):
+        if not self.session:
             await self.send_json({
-                "type": "posture_result",
-                "landmarks_detected": False,
-                "message": "No pose detected — make sure your upper body is visible.",
+                "type": "error",
+                "message": "No active session.",
             })
             return
 
+        await self._stop_frame_loop()
+        summary = await self._finalize_session()
+        await self._close_inference()
+
+        await self.send_json({
+            "type": "session_ended",
+            "summary": summary,
+        })
+
+    async def pose_landmarks(self, message):
+        """Reply from a PoseInferenceConsumer (channels inference backend)."""
+        if self.inference:
+            self.inference.deliver(message)
+
+    # ── Frame loop ──────────────────────────────────────────────────
+
+    def _start_frame_loop(self):
+        self.mailbox = FrameMailbox()
+        self.frame_task = asyncio.create_task(self._frame_loop())
+
+    async def _stop_frame_loop(self):
+        """Drop pending frames and wait for the in-flight frame to finish."""
+        if self.frame_task is None:
+            return
+        self.mailbox.close()
+        await self.frame_task
+        self.frame_task = None
+
+    async def _close_inference(self):
+        if self.inference:
+            await self.inference.close()
+            self.inference = None
+
+    async def _frame_loop(self):
+        deadline = settings.POSTURE_FRAME_DEADLINE_MS / 1000
+        last_started = 0.0
+
+        while True:
+            # Throttle to the target rate (or the rate the client was asked
+            # for); frames arriving meanwhile coalesce
+            fps = self.rate.level.fps if self.rate else settings.POSTURE_TARGET_FPS
+            interval = 1.0 / fps if fps else 0
+            delay = last_started + interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            frame = await self.mailbox.get()
+            if frame is None:
+                return
+
+            queue_latency = frame.age
+            if deadline and queue_latency > deadline:
+                self.mailbox.drop()
+                metrics.incr("posture.frames_expired")
+                if self.rate:
+                    self.rate.record_dropped()
+                continue
+
+            last_started = time.monotonic()
+            metrics.observe("posture.queue_latency", queue_latency)
+            try:
+                await self._process_frame(frame, queue_latency)
+            except Exception as e:
+                logger.exception("Error processing frame")
+                await self.send_json({
+                    "type": "error",
+                    "message": str(e),
+                })
+            await self._update_rate()
+
+    async def _update_rate(self):
+        if not self.rate:
+            return
+        change = self.rate.update()
+        if change:
+            level, reason = change
+            await self.send_json(level.as_message(reason))
+
+    async def _process_frame(self, frame, queue_latency):
+        dropped = self.mailbox.take_dropped()
+        if dropped:
+            metrics.incr("posture.frames_dropped", dropped)
+        frame_stats = {
+            "dropped_frames": dropped,
+            "queue_latency_ms": round(queue_latency * 1000, 1),
+        }
+        if frame.seq is not None:
+            frame_stats["seq"] = frame.seq
+
+        # While scoring, a frame that looks like the last inferred one
+        # reuses its result
+        thumbnail = None
+        if self.scene and not self.calibrating:
+            thumbnail = await asyncio.to_thread(frame_thumbnail, frame.data)
+            if self.scene.unchanged(thumbnail):
+                self.frames_unchanged += 1
+                metrics.incr("posture.frames_unchanged")
+                if self.rate:
+                    self.rate.record_frame(frame.age)
+                landmarks, result = self.last_result
+                await self._send_result(landmarks, result, {**frame_stats, "unchanged": True})
+                return
+
+        # Decode and extract landmarks off the event loop (CPU-bound)
+        node_load.begin(self.inference.backend.capacity)
+        try:
+            landmarks = await self.inference.infer(frame.data)
+        except InferenceBusy:
+            node_load.mark_busy()
+            if self.rate:
+                self.rate.record_dropped()
+            await self.send_json({"type": "frame_skipped", "reason": "busy"})
+            return
+        finally:
+            node_load.end()
+        if self.rate:
+            self.rate.record_frame(frame.age)
+        timings = self.inference.timings
+        if timings is not None:
+            frame_stats["decode_ms"] = round(timings.decode * 1000, 1)
+            frame_stats["preprocess_ms"] = round(timings.preprocess * 1000, 1)
+            frame_stats["inference_ms"] = round(timings.inference * 1000, 1)
+
         # Calibration mode: collect frames
-        if self.calibrating:
+        if landmarks is not None and self.calibrating:
             self.calibration_landmarks.append(landmarks)
             progress = len(self.calibration_landmarks) / CALIBRATION_FRAMES
 
@@ -169,23 +403,42 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
             return
 
         # Normal analysis mode
-        self.frame_count += 1
-        result = self.scorer.score(landmarks)
+        result = None if landmarks is None else self.scorer.score(landmarks)
+        if thumbnail is not None and not self.calibrating:
+            self.scene.update(thumbnail)
+            self.last_result = (landmarks, result)
+        await self._send_result(landmarks, result, frame_stats)
+
+    async def _send_result(self, landmarks, result, frame_stats):
+        """Record and send one frame's result (``result`` is PostureScorer.score's)."""
+        if landmarks is None:
+            await self.send_json({
+                "type": "posture_result",
+                "landmarks_detected": False,
+                "message": "No pose detected — make sure your upper body is visible.",
+                **frame_stats,
+            })
+            return
 
+        self.frame_count += 1
         if result is None:
             await self.send_json({
                 "type": "posture_result",
                 "landmarks_detected": True,
                 "message": "Insufficient landmark visibility for scoring.",
+                **frame_stats,
             })
             return
 
-        self.score_sum += result["overall_score"]
-        self.score_count += 1
+        self.stats.add(result, time.monotonic())
 
-        # Persist every Nth frame
+        # Persist every Nth frame (written in batches by the score buffer,
+        # or packed into the session's series when it ends)
         if self.frame_count % PERSIST_EVERY_N_FRAMES == 0:
-            await self._save_score(result)
+            if self.series is not None:
+                self.series.append(timezone.now(), result)
+            else:
+                get_score_buffer().add(self.session.id, result)
 
         # Build response with current + ideal landmarks
         response = {
@@ -201,35 +454,15 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
             },
             "issues": result["issues"],
             "landmarks": serialize_posture_landmarks(landmarks),
+            **frame_stats,
         }
 
         # Include ideal landmarks if calibration was done
-        if self.scorer.calibration:
-            response["ideal_landmarks"] = serialize_posture_landmarks(
-                self.scorer.calibration
-            )
+        if self.ideal_landmarks is not None:
+            response["ideal_landmarks"] = self.ideal_landmarks
 
         await self.send_json(response)
 
-    async def _handle_end_session(self):
-        if not self.session:
-            await self.send_json({
-                "type": "error",
-                "message": "No active session.",
-            })
-            return
-
-        summary = await self._finalize_session()
-
-        if self.pose_detector:
-            self.pose_detector.close()
-            self.pose_detector = None
-
-        await self.send_json({
-            "type": "session_ended",
-            "summary": summary,
-        })
-
     # ── Calibration ─────────────────────────────────────────────────
 
     async def _complete_calibration(self):
@@ -237,24 +470,14 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
         self.calibrating = False
 
         # Average each landmark across all calibration frames
-        num_landmarks = len(self.calibration_landmarks[0])
-        averaged = []
-        for i in range(num_landmarks):
-            avg_x = sum(f[i]["x"] for f in self.calibration_landmarks) / len(self.calibration_landmarks)
-            avg_y = sum(f[i]["y"] for f in self.calibration_landmarks) / len(self.calibration_landmarks)
-            avg_z = sum(f[i]["z"] for f in self.calibration_landmarks) / len(self.calibration_landmarks)
-            avg_vis = sum(f[i]["visibility"] for f in self.calibration_landmarks) / len(self.calibration_landmarks)
-            averaged.append({
-                "x": avg_x,
-                "y": avg_y,
-                "z": avg_z,
-                "visibility": avg_vis,
-            })
+        averaged = np.mean(np.stack(self.calibration_landmarks), axis=0, dtype=np.float64)
 
+        # Compiled into a baseline once; every later frame reuses it
         self.scorer = PostureScorer(calibration_landmarks=averaged)
 
         # Persist calibration data to the session
         cal_data = serialize_posture_landmarks(averaged)
+        self.ideal_landmarks = cal_data
         await self._save_calibration(cal_data)
 
         self.calibration_landmarks = []
@@ -264,14 +487,15 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
             "ideal_landmarks": cal_data,
         })
 
-    # ── Sync helpers (run in thread) ────────────────────────────────
-
-    def _process_frame_sync(self, frame_data):
-        """Decode base64 frame and extract landmarks. Runs in a thread."""
-        frame_rgb = decode_frame(frame_data)
-        if frame_rgb is None:
-            return None
-        return extract_landmarks(self.pose_detector, frame_rgb)
+    async def _reuse_last_calibration(self):
+        """Score against the user's most recent calibration, if they have one."""
+        cal_data = await self._load_last_calibration()
+        baseline = CalibrationBaseline.from_session_data(cal_data)
+        if baseline is None:
+            return
+        self.scorer = PostureScorer(baseline=baseline)
+        self.ideal_landmarks = cal_data
+        await self._save_calibration(cal_data)
 
     # ── DB operations ───────────────────────────────────────────────
 
@@ -280,15 +504,15 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
         return PostureSession.objects.create(user=self.user)
 
     @database_sync_to_async
-    def _save_score(self, result):
-        PostureScore.objects.create(
-            session=self.session,
-            overall_score=result["overall_score"],
-            head_position_score=result["head_position_score"],
-            shoulder_levelness_score=result["shoulder_levelness_score"],
-            shoulder_rounding_score=result["shoulder_rounding_score"],
-            spine_alignment_score=result["spine_alignment_score"],
-            issues=result["issues"],
+    def _load_last_calibration(self):
+        return (
+            PostureSession.objects
+            .filter(user=self.user)
+            .exclude(pk=self.session.pk)
+            .exclude(calibration_data={})
+            .order_by("-started_at")
+            .values_list("calibration_data", flat=True)
+            .first()
         )
 
     @database_sync_to_async
@@ -298,14 +522,26 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
 
     @database_sync_to_async
     def _finalize_session(self):
-        """Mark session as ended, compute average score."""
+        """Mark session as ended and save its average score and statistics."""
+        # Make sure every score of this session is written before it closes
+        if self.series is not None:
+            self._save_series()
+            self.session.score_count = len(self.series)
+        else:
+            get_score_buffer().flush()
+            self.session.score_count = PostureScore.objects.filter(session=self.session).count()
+
         self.session.ended_at = timezone.now()
         self.session.is_active = False
 
-        if self.score_count > 0:
-            self.session.average_score = round(self.score_sum / self.score_count, 1)
+        self.session.average_score = self.stats.average_score()
+        self.session.stats = self.stats.as_dict()
 
-        self.session.save(update_fields=["ended_at", "is_active", "average_score"])
+        self.session.save(update_fields=[
+            "ended_at", "is_active", "average_score", "stats", "score_count",
+        ])
+        record_session(self.session)
+        record_daily(self.session)
 
         summary = {
             "session_id": self.session.id,
@@ -314,8 +550,79 @@ class PostureConsumer(AsyncJsonWebsocketConsumer):
             ).total_seconds(),
             "average_score": self.session.average_score,
             "total_frames_analyzed": self.frame_count,
-            "scores_recorded": self.score_count,
+            "scores_recorded": self.stats.count,
+            "frames_dropped": self.mailbox.total_dropped if self.mailbox else 0,
+            "frames_unchanged": self.frames_unchanged,
+            "stats": self.session.stats,
         }
         self.session = None
         self.scorer = None
+        self.ideal_landmarks = None
+        self.series = None
+        self.rate = None
+        self.scene = None
+        self.last_result = None
         return summary
+
+    def _save_series(self):
+        data = self.series.tobytes()
+        PostureSeries.objects.update_or_create(
+            session=self.session,
+            defaults={
+                "sample_count": len(self.series),
+                "samples": data,
+                "rollups": build_rollups(
+                    decode_series(data), settings.POSTURE_SERIES_ROLLUPS,
+                ),
+            },
+        )
+
+
+class PoseInferenceConsumer(AsyncConsumer):
+    """
+    Channel-layer worker that runs pose inference on behalf of
+    PostureConsumer when POSE_INFERENCE_BACKEND is "channels".
+
+    Run one or more of these on inference nodes with:
+
+        python manage.py runinferenceworker
+
+    which loads the detector pool before listening (plain ``runworker
+    posture-inference`` works too, but loads it on the first frame).
+
+    Up to POSE_DETECTOR_POOL_SIZE frames are processed concurrently per
+    worker; further messages wait in the channel layer.
+    """
+
+    async def pose_infer(self, message):
+        if not hasattr(self, "slots"):
+            self.slots = asyncio.Semaphore(settings.POSE_DETECTOR_POOL_SIZE)
+            self.tasks = set()
+
+        await self.slots.acquire()
+        task = asyncio.create_task(self._infer(message))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _infer(self, message):
+        reply = {
+            "type": "pose.landmarks",
+            "request_id": message["request_id"],
+            "landmarks": None,
+        }
+        try:
+            landmarks, timings = await asyncio.to_thread(
+                process_frame, message["frame"], None, message.get("roi"), get_preprocessing(),
+            )
+            reply["timings"] = list(timings)
+            if landmarks is not None:
+                reply["landmarks"] = landmarks.tobytes()
+        except InferenceBusy:
+            reply["busy"] = True
+        except Exception as e:
+            logger.exception("Error running remote pose inference")
+            reply["error"] = str(e)
+        finally:
+            self.slots.release()
+
+        await self.channel_layer.send(message["reply_channel"], reply)
@@ -0,0 +1,219 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from posture_project import metrics
+
+from .landmark_utils import create_pose_detector, create_video_pose_detector
+
+logger = logging.getLogger(__name__)
+
+
+class DetectorPoolExhausted(Exception):
+    """Raised when no pose detector becomes free within the acquire timeout."""
+
+
+class PooledDetector:
+    """
+    Thin wrapper around a PoseLandmarker that tracks how many frames it has
+    processed and whether it is still healthy. Exposes the same ``detect``
+    method, so it can be passed anywhere a detector is expected.
+    """
+
+    def __init__(self, detector):
+        self.detector = detector
+        self.frames = 0
+        self.healthy = True
+
+    def detect(self, image):
+        try:
+            result = self.detector.detect(image)
+        except Exception:
+            self.healthy = False
+            raise
+        self.frames += 1
+        return result
+
+    def close(self):
+        try:
+            self.detector.close()
+        except Exception:
+            logger.exception("Error closing pose detector")
+
+
+class DetectorPool:
+    """
+    Process-wide, bounded pool of MediaPipe pose detectors.
+
+    Detectors are created lazily up to ``size`` and handed out with
+    checkout/return semantics. When every detector is in use, ``acquire``
+    blocks for up to ``acquire_timeout`` seconds and then raises
+    DetectorPoolExhausted, so callers get back-pressure instead of an
+    unbounded number of resident models. Detectors that raised during
+    detection, or that have processed ``max_frames`` frames, are closed on
+    return and replaced on demand. Metrics are reported under ``name``.
+    """
+
+    def __init__(
+        self,
+        size,
+        acquire_timeout=2.0,
+        max_frames=None,
+        factory=create_pose_detector,
+        name="pose_pool",
+    ):
+        self.name = name
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.max_frames = max_frames
+        self._factory = factory
+        self._idle = []
+        self._created = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+    def warm(self, count=None):
+        """Pre-create up to ``count`` idle detectors (default: the full pool)."""
+        count = self.size if count is None else min(count, self.size)
+        while True:
+            with self._cond:
+                if self._created >= count:
+                    return
+                self._created += 1
+            try:
+                pooled = PooledDetector(self._factory())
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._update_gauges()
+                logger.exception("Failed to pre-warm pose detector")
+                return
+            metrics.incr(f"{self.name}.detectors_created")
+            with self._cond:
+                self._idle.append(pooled)
+                self._update_gauges()
+                self._cond.notify()
+
+    def acquire(self, timeout=None):
+        """Check out a detector, creating one if the pool is not yet full."""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        deadline = start + timeout
+
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    metrics.incr(f"{self.name}.exhausted")
+                    raise DetectorPoolExhausted(
+                        f"No pose detector available after {timeout:.1f}s"
+                    )
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+            if self._idle:
+                pooled = self._idle.pop()
+            else:
+                pooled = None
+                self._created += 1
+            self._update_gauges()
+
+        if pooled is None:
+            try:
+                pooled = PooledDetector(self._factory())
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._update_gauges()
+                    self._cond.notify()
+                raise
+            metrics.incr(f"{self.name}.detectors_created")
+
+        metrics.observe(f"{self.name}.wait", time.perf_counter() - start)
+        return pooled
+
+    def release(self, pooled):
+        """Return a detector to the pool, recycling it if it is worn out."""
+        recycle = not pooled.healthy or (
+            self.max_frames is not None and pooled.frames >= self.max_frames
+        )
+        if recycle:
+            pooled.close()
+            metrics.incr(f"{self.name}.recycled")
+
+        with self._cond:
+            self._in_use -= 1
+            if recycle:
+                self._created -= 1
+            else:
+                self._idle.append(pooled)
+            self._update_gauges()
+            self._cond.notify()
+
+    @contextmanager
+    def detector(self, timeout=None):
+        """Borrow a detector for the duration of a ``with`` block."""
+        pooled = self.acquire(timeout)
+        try:
+            yield pooled
+        finally:
+            self.release(pooled)
+
+    def close(self):
+        """Close every idle detector. Checked-out detectors are closed on return."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._update_gauges()
+        for pooled in idle:
+            pooled.close()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+            }
+
+    def _update_gauges(self):
+        # Caller must hold self._cond
+        metrics.set_gauge(f"{self.name}.size", self.size)
+        metrics.set_gauge(f"{self.name}.created", self._created)
+        metrics.set_gauge(f"{self.name}.in_use", self._in_use)
+        metrics.set_gauge(f"{self.name}.idle", len(self._idle))
+
+
+# Pools per running mode: "image" detectors are shared frame by frame, "video"
+# detectors are held by one session at a time so they can track the pose
+_pools = {}
+_pool_lock = threading.Lock()
+
+# mode: (metrics name, detector factory, pool size setting)
+_FACTORIES = {
+    "image": ("pose_pool", create_pose_detector, "POSE_DETECTOR_POOL_SIZE"),
+    "video": ("pose_video_pool", create_video_pose_detector, "POSE_VIDEO_DETECTOR_POOL_SIZE"),
+}
+
+
+def get_detector_pool(mode="image"):
+    """Return the process-wide detector pool for ``mode``, creating it on first use."""
+    pool = _pools.get(mode)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(mode)
+            if pool is None:
+                name, factory, size_setting = _FACTORIES[mode]
+                pool = _pools[mode] = DetectorPool(
+                    size=getattr(settings, size_setting),
+                    acquire_timeout=settings.POSE_DETECTOR_ACQUIRE_TIMEOUT,
+                    max_frames=settings.POSE_DETECTOR_MAX_FRAMES or None,
+                    factory=factory,
+                    name=name,
+                )
+    return pool
@@ -0,0 +1,111 @@
+"""
+Fixed-width time bucketing of a session's scores for charts.
+
+Row-stored sessions are bucketed in SQL (GROUP BY on the bucket number),
+series-stored sessions with NumPy; both return the same columnar shape as
+posture.series.rollup. Bucket widths are widened when needed so a session
+never yields more than MAX_BUCKETS points, however long it ran.
+"""
+
+import math
+import re
+
+from django.db.models import Avg, Count, F, FloatField, Func, Max, Min, Value
+from django.db.models.functions import Floor, Greatest
+
+from .series import COMPONENTS, decode_series, rollup
+
+MAX_BUCKETS = 500
+
+_RESOLUTION_RE = re.compile(r"^(\d+)([smh])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600}
+
+
+class EpochSeconds(Func):
+    """Seconds since the Unix epoch of a datetime expression, as a float."""
+
+    output_field = FloatField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template="EXTRACT(EPOCH FROM %(expressions)s)", **extra_context
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="((julianday(%(expressions)s) - 2440587.5) * 86400.0)",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template="UNIX_TIMESTAMP(%(expressions)s)", **extra_context
+        )
+
+
+def parse_resolution(value):
+    """
+    Parse a resolution like "10s", "5m" or "1h" into seconds. "auto" (and
+    "") returns 0, meaning "as fine as MAX_BUCKETS allows". Raises
+    ValueError on anything else.
+    """
+    if value in ("", "auto"):
+        return 0
+    match = _RESOLUTION_RE.match(value)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid resolution {value!r}; use e.g. 10s, 1m, 1h or auto")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+def bucket_width(requested_seconds, duration_seconds):
+    """The bucket width to use: the requested one, widened to fit MAX_BUCKETS."""
+    minimum = math.ceil(max(duration_seconds, 0) / MAX_BUCKETS) or 1
+    return max(requested_seconds, minimum)
+
+
+def bucket_score_rows(scores, started_at, width):
+    """
+    Bucket a PostureScore queryset into ``width``-second buckets from
+    ``started_at``, aggregated in the database.
+    """
+    # Float epoch arithmetic can put a score stamped at started_at a hair
+    # before it, which would open a bucket at t < 0
+    offset = Greatest(
+        EpochSeconds(F("timestamp")) - Value(started_at.timestamp()), Value(0.0),
+    )
+    rows = (
+        scores.order_by()
+        .annotate(bucket=Floor(offset / Value(float(width))))
+        .values("bucket")
+        .annotate(
+            count=Count("id"),
+            **{
+                f"{component}_{stat}": func(f"{component}_score")
+                for component in COMPONENTS
+                for stat, func in (("min", Min), ("mean", Avg), ("max", Max))
+            },
+        )
+        .order_by("bucket")
+    )
+
+    result = {"t": [], "count": []}
+    for component in COMPONENTS:
+        result[component] = {"min": [], "mean": [], "max": []}
+    for row in rows:
+        result["t"].append(int(row["bucket"]) * width)
+        result["count"].append(row["count"])
+        for component in COMPONENTS:
+            for stat in ("min", "mean", "max"):
+                value = row[f"{component}_{stat}"]
+                result[component][stat].append(round(value, 1) if stat == "mean" else value)
+    return result
+
+
+def bucket_series(series, width):
+    """Bucket a PostureSeries, using its stored rollup when one matches."""
+    stored = series.rollups.get(f"{width}s")
+    if stored is not None:
+        return stored
+    return rollup(decode_series(series.samples), width)
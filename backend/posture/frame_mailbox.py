@@ -0,0 +1,68 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PendingFrame:
+    data: object
+    seq: int = None
+    received_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age(self):
+        """Seconds since the frame arrived on the socket."""
+        return time.monotonic() - self.received_at
+
+
+class FrameMailbox:
+    """
+    Single-slot per-connection frame mailbox where the newest frame wins.
+
+    A frame that arrives while another is still pending replaces it, so
+    ``get`` always returns the latest frame. ``take_dropped`` reports how
+    many frames were discarded since it was last called, so each result
+    can say how much was skipped.
+    """
+
+    def __init__(self):
+        self._frame = None
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._dropped = 0
+        self.total_dropped = 0
+
+    def put(self, frame):
+        if self._closed:
+            return
+        if self._frame is not None:
+            self.drop()
+        self._frame = frame
+        self._ready.set()
+
+    def drop(self, count=1):
+        """Record frames discarded without being processed."""
+        self._dropped += count
+        self.total_dropped += count
+
+    def take_dropped(self):
+        dropped, self._dropped = self._dropped, 0
+        return dropped
+
+    async def get(self):
+        """Wait for the next frame. Returns None once the mailbox is closed."""
+        while self._frame is None:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        frame, self._frame = self._frame, None
+        return frame
+
+    def close(self):
+        """Discard the pending frame and wake any waiting consumer."""
+        if self._frame is not None:
+            self.drop()
+            self._frame = None
+        self._closed = True
+        self._ready.set()
@@ -0,0 +1,54 @@
+"""
+Binary WebSocket frame protocol.
+
+Clients that offer the ``posture.binary.v1`` subprotocol at connect time
+may send frames as binary WebSocket messages instead of base64 JPEG inside
+a JSON ``frame`` action. JSON actions keep working on the same socket.
+
+A binary message is either:
+
+    <raw JPEG bytes>                  — starts with the JPEG SOI marker
+    <8-byte header><JPEG bytes>       — header layout below
+
+Header (little-endian):
+
+    2s  magic    b"PF"
+    B   version  1
+    B   flags    reserved, must be 0
+    I   seq      client frame sequence number, echoed back in results
+"""
+
+import struct
+
+BINARY_SUBPROTOCOL = "posture.binary.v1"
+
+HEADER = struct.Struct("<2sBBI")
+HEADER_MAGIC = b"PF"
+HEADER_VERSION = 1
+JPEG_SOI = b"\xff\xd8"
+
+
+class FrameProtocolError(ValueError):
+    """Raised for binary messages that don't follow the frame protocol."""
+
+
+def parse_binary_frame(data):
+    """
+    Split a binary message into (seq, payload).
+
+    ``payload`` is a memoryview over ``data`` so the JPEG bytes are never
+    copied; ``seq`` is None for raw JPEG messages.
+    """
+    view = memoryview(data)
+    if view[:2] == JPEG_SOI:
+        return None, view
+
+    if len(view) < HEADER.size:
+        raise FrameProtocolError("Binary frame is too short.")
+
+    magic, version, _flags, seq = HEADER.unpack_from(view)
+    if magic != HEADER_MAGIC:
+        raise FrameProtocolError("Binary frame is neither JPEG nor a framed payload.")
+    if version != HEADER_VERSION:
+        raise FrameProtocolError(f"Unsupported frame protocol version: {version}")
+    return seq, view[HEADER.size:]
@@ -0,0 +1,436 @@
+"""
+Pose inference backends.
+
+The consumer hands each frame to an InferenceSession and awaits the
+landmarks; where decode and detection actually run is decided here:
+
+    "thread"  — default thread executor, detectors borrowed from the
+                process-wide DetectorPool (or, with POSE_RUNNING_MODE
+                "video", a tracking detector held for the whole session,
+                so at most POSE_VIDEO_DETECTOR_POOL_SIZE sessions at once)
+    "process" — a pool of worker processes that each own a PoseLandmarker;
+                JPEG payloads are handed over through shared memory
+    "channels" — frames are sent over the channel layer to a separate group
+                of inference workers (``manage.py runinferenceworker``)
+
+Select one with the POSE_INFERENCE_BACKEND setting.
+
+Every backend crops IMAGE-mode detection to the region around the previous
+frame's posture landmarks (see landmark_utils.detect_pose); the session
+keeps that ROI and the last frame's decode/preprocess/inference timings.
+"""
+
+import asyncio
+import atexit
+import itertools
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+from channels.exceptions import ChannelFull
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+from posture_project import metrics
+
+from . import inference_worker
+from .detector_pool import DetectorPoolExhausted, get_detector_pool
+from .landmark_utils import (
+    NUM_LANDMARKS,
+    FrameTimings,
+    Preprocessing,
+    decode_and_detect,
+    detect_pose,
+    jpeg_bytes,
+    landmark_roi,
+    timed_decode,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBusy(Exception):
+    """Raised when the backend has no capacity for another frame right now."""
+
+
+class InferenceSession:
+    """Per-connection handle onto a backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        # Where to look for the pose in the next frame, and how long the
+        # last frame took (FrameTimings)
+        self.roi = None
+        self.timings = None
+
+    async def infer(self, frame_data):
+        """Return the (33, 4) landmark array for one JPEG frame, or None if no pose was found."""
+        return await self.backend.infer(frame_data, self)
+
+    def frame_done(self, landmarks, timings):
+        """Record a frame's timings and aim the next frame's ROI. Returns ``landmarks``."""
+        self.timings = timings
+        metrics.observe("inference.decode", timings.decode)
+        metrics.observe("inference.preprocess", timings.preprocess)
+        metrics.observe("inference.detect", timings.inference)
+        if timings.roi_hit is not None:
+            metrics.incr("inference.roi_hits" if timings.roi_hit else "inference.roi_misses")
+        self.roi = landmark_roi(landmarks, settings.POSE_ROI_PADDING)
+        return landmarks
+
+    def deliver(self, message):
+        """Hand a reply from a remote inference worker to the waiting frame."""
+
+    async def close(self):
+        pass
+
+
+class InferenceBackend:
+    """Base class for the places pose inference can run."""
+
+    # Frames this process can run inference on at once (None: unknown)
+    capacity = None
+
+    async def open_session(self, reply_channel=None):
+        return InferenceSession(self)
+
+    async def infer(self, frame_data, session):
+        raise NotImplementedError
+
+    def warm(self):
+        """Load models ahead of the first session. Called once at startup."""
+
+    def shutdown(self):
+        pass
+
+
+# ── Thread backend ──────────────────────────────────────────────────
+
+
+def get_preprocessing():
+    return Preprocessing(
+        roi_padding=settings.POSE_ROI_PADDING,
+        roi_size=settings.POSE_ROI_SIZE,
+        max_side=settings.POSE_MAX_FRAME_SIDE,
+    )
+
+
+def process_frame(frame_data, detector=None, roi=None, preprocessing=None):
+    """
+    Decode a JPEG frame and extract landmarks (decode_and_detect, the same
+    pipeline the worker processes run). Runs in a worker thread. Without a
+    session-held ``detector`` one is borrowed from the shared IMAGE-mode
+    pool for just this frame. Returns (landmarks, FrameTimings).
+    """
+    if detector:
+        return decode_and_detect(detector, frame_data, roi, preprocessing)
+    try:
+        with get_detector_pool().detector() as pooled:
+            return decode_and_detect(pooled, frame_data, roi, preprocessing)
+    except DetectorPoolExhausted as e:
+        raise InferenceBusy(str(e)) from e
+
+
+def detect_with_pool(frame_rgb, roi=None, preprocessing=None):
+    """detect_pose on an already decoded frame with a borrowed IMAGE-mode detector."""
+    try:
+        with get_detector_pool().detector() as pooled:
+            return detect_pose(pooled, frame_rgb, roi, preprocessing)
+    except DetectorPoolExhausted as e:
+        raise InferenceBusy(str(e)) from e
+
+
+def track_frame(frame_data, detector, was_tracking, preprocessing=None):
+    """
+    process_frame for a VIDEO-mode detector. Returns (landmarks,
+    FrameTimings, tracked).
+
+    No ROI is applied: the tracker already follows the previous pose, and
+    moving crops would break its tracking. When the detector loses a pose
+    it was tracking (``was_tracking``), the frame is run again through a
+    pooled IMAGE-mode detector so the frame still gets a result. Only that
+    first frame falls back: while nobody is in view the tracking detector's
+    own detection pass is enough.
+    """
+    frame_rgb, decode = timed_decode(frame_data, preprocessing)
+    if frame_rgb is None:
+        return None, FrameTimings(decode, 0.0, 0.0, None), was_tracking
+    landmarks, timings = detect_pose(detector, frame_rgb, None, preprocessing)
+    timings = timings._replace(decode=decode)
+    if landmarks is not None or not was_tracking:
+        return landmarks, timings, landmarks is not None
+    metrics.incr("pose_tracking.lost")
+    landmarks, fallback = detect_with_pool(frame_rgb, None, preprocessing)
+    timings = timings._replace(
+        preprocess=timings.preprocess + fallback.preprocess,
+        inference=timings.inference + fallback.inference,
+    )
+    return landmarks, timings, False
+
+
+class ThreadSession(InferenceSession):
+    def __init__(self, backend, detector=None, mode="image"):
+        super().__init__(backend)
+        self.detector = detector
+        self.mode = mode
+        # Whether the tracking detector found a pose on the previous frame
+        self.tracking = False
+
+    async def close(self):
+        # Return a session-held detector to the shared pool
+        if self.detector:
+            get_detector_pool(self.mode).release(self.detector)
+            self.detector = None
+
+
+class ThreadBackend(InferenceBackend):
+    """Runs inference in the event loop's default thread executor."""
+
+    @property
+    def capacity(self):
+        return get_detector_pool(settings.POSE_RUNNING_MODE).size
+
+    async def open_session(self, reply_channel=None):
+        # Tracking detectors only work when fed one session's frames in order
+        mode = settings.POSE_RUNNING_MODE
+        if mode != "video" and settings.POSE_DETECTOR_CHECKOUT != "session":
+            return ThreadSession(self)
+        try:
+            detector = await asyncio.to_thread(get_detector_pool(mode).acquire)
+        except DetectorPoolExhausted as e:
+            raise InferenceBusy(str(e)) from e
+        return ThreadSession(self, detector, mode)
+
+    async def infer(self, frame_data, session):
+        if session.mode != "video":
+            landmarks, timings = await asyncio.to_thread(
+                process_frame, frame_data, session.detector, session.roi, get_preprocessing(),
+            )
+        else:
+            landmarks, timings, session.tracking = await asyncio.to_thread(
+                track_frame, frame_data, session.detector, session.tracking, get_preprocessing(),
+            )
+        return session.frame_done(landmarks, timings)
+
+    def warm(self):
+        get_detector_pool(settings.POSE_RUNNING_MODE).warm(settings.POSE_DETECTOR_POOL_WARM)
+
+    def shutdown(self):
+        get_detector_pool("image").close()
+        get_detector_pool("video").close()
+
+
+# ── Process backend ─────────────────────────────────────────────────
+
+
+class SharedFrameSlots:
+    """
+    Fixed set of shared-memory buffers used to hand JPEG payloads to worker
+    processes without pickling them. The number of slots bounds how many
+    frames can be in flight at once.
+    """
+
+    def __init__(self, count, slot_bytes):
+        self.slot_bytes = slot_bytes
+        self._segments = [
+            shared_memory.SharedMemory(create=True, size=slot_bytes)
+            for _ in range(count)
+        ]
+        self._free = queue.SimpleQueue()
+        for segment in self._segments:
+            self._free.put(segment)
+
+    def acquire(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return None
+
+    def release(self, segment):
+        self._free.put(segment)
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+
+class ProcessBackend(InferenceBackend):
+    """
+    Runs decode and detection in a pool of worker processes, so inference
+    scales across cores independently of the ASGI event loop and the GIL.
+    """
+
+    def __init__(self, workers, slot_bytes):
+        self.workers = workers
+        self.capacity = workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=inference_worker.init_worker,
+        )
+        # Two slots per worker keeps every worker busy while the next
+        # frame is being copied in.
+        self.slots = SharedFrameSlots(workers * 2, slot_bytes)
+
+    async def infer(self, frame_data, session):
+        payload = jpeg_bytes(frame_data)
+
+        preprocessing = get_preprocessing()
+
+        if len(payload) > self.slots.slot_bytes:
+            metrics.incr("inference.oversized_frames")
+            landmarks, timings = await asyncio.wrap_future(
+                self.executor.submit(
+                    inference_worker.infer_bytes, bytes(payload), session.roi, preprocessing,
+                )
+            )
+            return session.frame_done(landmarks, timings)
+
+        segment = self.slots.acquire()
+        if segment is None:
+            metrics.incr("inference.busy")
+            raise InferenceBusy("All inference workers are busy")
+        try:
+            segment.buf[:len(payload)] = payload
+            future = self.executor.submit(
+                inference_worker.infer_shared,
+                segment.name,
+                len(payload),
+                session.roi,
+                preprocessing,
+            )
+        except BaseException:
+            self.slots.release(segment)
+            raise
+        # Only hand the slot back once the worker is done reading it, even
+        # if the awaiting coroutine is cancelled first.
+        future.add_done_callback(lambda _: self.slots.release(segment))
+        landmarks, timings = await asyncio.wrap_future(future)
+        return session.frame_done(landmarks, timings)
+
+    def warm(self):
+        futures = [
+            self.executor.submit(inference_worker.ping) for _ in range(self.workers)
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except Exception:
+            logger.exception("Failed to start inference workers")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.slots.close()
+
+
+# ── Channel layer backend ───────────────────────────────────────────
+
+
+class ChannelSession(InferenceSession):
+    def __init__(self, backend, reply_channel):
+        super().__init__(backend)
+        self.reply_channel = reply_channel
+        self.pending = {}
+
+    def deliver(self, message):
+        future = self.pending.pop(message["request_id"], None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    async def close(self):
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+
+
+class ChannelLayerBackend(InferenceBackend):
+    """
+    Sends frames over the channel layer to PoseInferenceConsumer workers and
+    waits for their landmarks, so WebSocket front-ends and CPU-heavy
+    inference nodes can be scaled independently.
+
+    Replies arrive as ``pose.landmarks`` messages on the WebSocket
+    consumer's own channel, which passes them to ChannelSession.deliver.
+    """
+
+    def __init__(self, channel, timeout):
+        self.channel = channel
+        self.timeout = timeout
+        self._request_ids = itertools.count(1)
+
+    async def open_session(self, reply_channel=None):
+        if reply_channel is None:
+            raise ValueError("The channels inference backend needs a reply channel")
+        return ChannelSession(self, reply_channel)
+
+    async def infer(self, frame_data, session):
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        session.pending[request_id] = future
+
+        try:
+            await get_channel_layer().send(self.channel, {
+                "type": "pose.infer",
+                "reply_channel": session.reply_channel,
+                "request_id": request_id,
+                "frame": bytes(jpeg_bytes(frame_data)),
+                "roi": session.roi,
+            })
+            reply = await asyncio.wait_for(future, self.timeout)
+        except ChannelFull as e:
+            metrics.incr("inference.busy")
+            raise InferenceBusy("Inference queue is full") from e
+        except asyncio.TimeoutError as e:
+            metrics.incr("inference.timeouts")
+            raise InferenceBusy("Timed out waiting for an inference worker") from e
+        finally:
+            session.pending.pop(request_id, None)
+
+        if reply.get("busy"):
+            raise InferenceBusy("Inference worker is busy")
+        if reply.get("error"):
+            raise RuntimeError(reply["error"])
+        landmarks = None
+        if reply["landmarks"] is not None:
+            # Landmark arrays travel as raw float32 bytes
+            landmarks = np.frombuffer(reply["landmarks"], dtype=np.float32).reshape(NUM_LANDMARKS, 4)
+        return session.frame_done(landmarks, FrameTimings(*reply["timings"]))
+
+
+# ── Backend selection ───────────────────────────────────────────────
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_inference_backend(name):
+    if name == "thread":
+        return ThreadBackend()
+    if name == "process":
+        return ProcessBackend(
+            workers=settings.POSE_INFERENCE_WORKERS or os.cpu_count() or 1,
+            slot_bytes=settings.POSE_INFERENCE_SLOT_BYTES,
+        )
+    if name == "channels":
+        return ChannelLayerBackend(
+            channel=settings.POSE_INFERENCE_CHANNEL,
+            timeout=settings.POSE_INFERENCE_TIMEOUT,
+        )
+    raise ValueError(f"Unknown POSE_INFERENCE_BACKEND: {name}")
+
+
+def get_inference_backend():
+    """Return the process-wide inference backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_inference_backend(settings.POSE_INFERENCE_BACKEND)
+                atexit.register(_backend.shutdown)
+    return _backend
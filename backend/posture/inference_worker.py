@@ -0,0 +1,53 @@
+"""
+Code that runs inside inference worker processes.
+
+Kept free of Django imports so spawned workers start quickly. Each worker
+owns one PoseLandmarker for its whole lifetime and reads JPEG payloads out
+of shared-memory slots created by the parent process.
+"""
+
+from multiprocessing import shared_memory
+
+from .landmark_utils import create_pose_detector, decode_and_detect
+
+_detector = None
+_segments = {}
+
+
+def init_worker():
+    """Process-pool initializer: load the pose model once per worker."""
+    global _detector
+    _detector = create_pose_detector()
+
+
+def ping():
+    """No-op task used to force the pool to spawn (and warm) its workers."""
+    return True
+
+
+def _attach(name):
+    segment = _segments.get(name)
+    if segment is None:
+        # Workers share the parent's resource tracker, which unlinks the
+        # segment once the parent is done with it.
+        segment = shared_memory.SharedMemory(name=name)
+        _segments[name] = segment
+    return segment
+
+
+def infer_shared(name, length, roi=None, preprocessing=None):
+    """
+    Decode ``length`` JPEG bytes from a shared-memory slot and detect the
+    pose. Returns (landmarks, FrameTimings).
+    """
+    segment = _attach(name)
+    payload = segment.buf[:length]
+    try:
+        return decode_and_detect(_detector, payload, roi, preprocessing)
+    finally:
+        payload.release()
+
+
+def infer_bytes(data, roi=None, preprocessing=None):
+    """Fallback for payloads too large for a shared-memory slot."""
+    return decode_and_detect(_detector, data, roi, preprocessing)
@@ -1,6 +1,8 @@
 import base64
 import math
 import os
+import time
+from collections import namedtuple
 
 import cv2
 import mediapipe as mp
@@ -16,6 +18,11 @@ MODEL_PATH = os.path.join(
     "pose_landmarker_lite.task",
 )
 
+# MediaPipe Pose produces 33 landmarks. In array form they are stored as a
+# (33, 4) float32 array with these columns:
+NUM_LANDMARKS = 33
+X, Y, Z, VISIBILITY = range(4)
+
 # Landmark indices we care about for posture analysis
 LEFT_EAR = 7
 RIGHT_EAR = 8
@@ -24,6 +31,17 @@ RIGHT_SHOULDER = 12
 LEFT_HIP = 23
 RIGHT_HIP = 24
 
+# Names of the posture landmarks as sent to the frontend and stored in
+# PostureSession.calibration_data
+SERIALIZED_LANDMARKS = {
+    "left_ear": LEFT_EAR,
+    "right_ear": RIGHT_EAR,
+    "left_shoulder": LEFT_SHOULDER,
+    "right_shoulder": RIGHT_SHOULDER,
+    "left_hip": LEFT_HIP,
+    "right_hip": RIGHT_HIP,
+}
+
 # Connections to draw for the body outline
 POSTURE_CONNECTIONS = [
     (LEFT_EAR, RIGHT_EAR),
@@ -38,37 +56,268 @@ POSTURE_CONNECTIONS = [
 
 def create_pose_detector(
     min_detection_confidence=0.5,
+    min_presence_confidence=0.5,
     min_tracking_confidence=0.5,
+    running_mode=VisionTaskRunningMode.IMAGE,
 ):
-    """Create a MediaPipe PoseLandmarker instance."""
+    """
+    Create a MediaPipe PoseLandmarker instance.
+
+    In IMAGE mode every frame runs person detection. In VIDEO mode the
+    landmarker tracks the pose from the previous frame and only re-runs
+    detection when tracking confidence drops below
+    ``min_tracking_confidence``; it must be fed frames in order (see
+    VideoPoseDetector).
+    """
     options = PoseLandmarkerOptions(
         base_options=BaseOptions(model_asset_path=MODEL_PATH),
-        running_mode=VisionTaskRunningMode.IMAGE,
+        running_mode=running_mode,
         num_poses=1,
         min_pose_detection_confidence=min_detection_confidence,
-        min_pose_presence_confidence=min_tracking_confidence,
+        min_pose_presence_confidence=min_presence_confidence,
+        min_tracking_confidence=min_tracking_confidence,
     )
     return PoseLandmarker.create_from_options(options)
 
 
-def decode_frame(base64_frame):
-    """Decode a base64-encoded JPEG frame to a numpy array (RGB)."""
-    # Strip data URI prefix if present
-    if "," in base64_frame:
-        base64_frame = base64_frame.split(",", 1)[1]
+class VideoPoseDetector:
+    """
+    A VIDEO-mode PoseLandmarker behind the IMAGE-mode ``detect`` interface.
+
+    MediaPipe needs strictly increasing timestamps per landmarker, so frames
+    are stamped from a monotonic clock. That also holds across sessions when
+    the detector is pooled; tracking simply restarts from detection when the
+    next session's first frame does not match the last pose.
+    """
+
+    def __init__(self, landmarker):
+        self.landmarker = landmarker
+        self._last_timestamp_ms = -1
+
+    def detect(self, image):
+        timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return self.landmarker.detect_for_video(image, timestamp_ms)
+
+    def close(self):
+        self.landmarker.close()
+
+
+def create_video_pose_detector(**kwargs):
+    """Create a VideoPoseDetector (see create_pose_detector for the options)."""
+    return VideoPoseDetector(
+        create_pose_detector(running_mode=VisionTaskRunningMode.VIDEO, **kwargs)
+    )
+
+
+def jpeg_bytes(frame_data):
+    """Return raw JPEG bytes for a base64 string; bytes-like input is returned as-is."""
+    if isinstance(frame_data, str):
+        # Strip data URI prefix if present
+        if "," in frame_data:
+            frame_data = frame_data.split(",", 1)[1]
+        return base64.b64decode(frame_data)
+    return frame_data
+
+
+# Start-of-frame markers (baseline, progressive, lossless, arithmetic...);
+# their segment holds the image dimensions
+_JPEG_SOF_MARKERS = frozenset(
+    {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+)
+
+# libjpeg can scale by 1/2, 1/4 or 1/8 while decoding, skipping most of the
+# IDCT work for the discarded detail
+_REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
 
-    img_bytes = base64.b64decode(base64_frame)
-    np_arr = np.frombuffer(img_bytes, dtype=np.uint8)
-    frame_bgr = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-    if frame_bgr is None:
+
+def jpeg_size(data):
+    """(width, height) from a JPEG's frame header, or None if it has none."""
+    data = memoryview(data)
+    end = len(data)
+    if end < 4 or data[0] != 0xFF or data[1] != 0xD8:
         return None
-    return cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+    i = 2
+    while i + 9 <= end:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            # Fill byte before the marker
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # Markers without a length
+            i += 2
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height = (data[i + 5] << 8) | data[i + 6]
+            width = (data[i + 7] << 8) | data[i + 8]
+            return width, height
+        i += 2 + ((data[i + 2] << 8) | data[i + 3])
+    return None
 
 
-def extract_landmarks(pose_detector, frame_rgb):
+def reduced_decode_flag(size, max_side):
+    """
+    The imdecode flag for the strongest DCT-domain reduction that still
+    leaves the longer side at least ``max_side`` pixels.
+    """
+    if not max_side or size is None:
+        return cv2.IMREAD_COLOR
+    longer = max(size)
+    for factor, flag in _REDUCED_DECODE_FLAGS:
+        if longer // factor >= max_side:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_frame(frame_data, max_side=0):
+    """
+    Decode a JPEG frame to a numpy array (RGB).
+
+    Accepts either a base64 string (JSON protocol) or any bytes-like object
+    holding raw JPEG data (binary protocol). Bytes-like input is wrapped
+    without copying before being handed to OpenCV.
+
+    With ``max_side``, frames at least twice that size are decoded at
+    1/2, 1/4 or 1/8 scale (never below ``max_side``), which is cheaper
+    than decoding at full size and resizing. Normalized landmark
+    coordinates are unaffected.
+    """
+    data = jpeg_bytes(frame_data)
+    flag = reduced_decode_flag(jpeg_size(data), max_side)
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flag)
+    if frame is None:
+        return None
+    # Swap the channels in place rather than allocating a second frame
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+
+
+# How frames are prepared for detection (see detect_pose):
+#   roi_padding  margin added around the posture landmarks' bounding box on
+#                each side, as a fraction of its longer side (0 = no ROI)
+#   roi_size     longer side, in pixels, ROI crops are scaled down to
+#   max_side     longer side full frames are scaled down to (0 = as sent)
+Preprocessing = namedtuple("Preprocessing", ["roi_padding", "roi_size", "max_side"])
+
+# Per-frame timings in seconds. roi_hit is None when no ROI was tried and
+# False when the ROI missed and the full frame was used instead.
+FrameTimings = namedtuple("FrameTimings", ["decode", "preprocess", "inference", "roi_hit"])
+
+
+def landmark_roi(landmarks, padding, min_visibility=0.5):
+    """
+    Normalized (x0, y0, x1, y1) region around the posture landmarks, padded
+    by ``padding`` times the box's longer side, or None when any of them is
+    not visible enough to place it.
+    """
+    if landmarks is None or padding <= 0:
+        return None
+    points = landmarks[list(SERIALIZED_LANDMARKS.values())]
+    if (points[:, VISIBILITY] < min_visibility).any():
+        return None
+    # Plain floats, so the ROI can travel over the channel layer
+    (x0, y0), (x1, y1) = points[:, :2].min(axis=0).tolist(), points[:, :2].max(axis=0).tolist()
+    margin = padding * max(x1 - x0, y1 - y0)
+    x0, y0 = max(x0 - margin, 0.0), max(y0 - margin, 0.0)
+    x1, y1 = min(x1 + margin, 1.0), min(y1 + margin, 1.0)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1, y1
+
+
+def scale_down(image, max_side):
+    """Shrink ``image`` so its longer side is at most ``max_side`` pixels."""
+    height, width = image.shape[:2]
+    if not max_side or max(height, width) <= max_side:
+        return image
+    scale = max_side / max(height, width)
+    size = (max(round(width * scale), 1), max(round(height * scale), 1))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def crop_to_roi(frame_rgb, roi, size):
+    """
+    Crop a normalized ROI out of a frame and scale it down to ``size``.
+    Returns the crop and the normalized (x0, y0, width, height) it actually
+    covers after snapping to whole pixels.
+    """
+    height, width = frame_rgb.shape[:2]
+    x0, y0 = int(roi[0] * width), int(roi[1] * height)
+    x1, y1 = max(math.ceil(roi[2] * width), x0 + 1), max(math.ceil(roi[3] * height), y0 + 1)
+    crop = np.ascontiguousarray(scale_down(frame_rgb[y0:y1, x0:x1], size))
+    return crop, (x0 / width, y0 / height, (x1 - x0) / width, (y1 - y0) / height)
+
+
+def detect_pose(pose_detector, frame_rgb, roi=None, preprocessing=None):
+    """
+    Detect the pose in a decoded RGB frame. Returns (landmarks, FrameTimings);
+    the decode timing is left at 0 for the caller to fill in.
+
+    With an ``roi`` (normally landmark_roi of the previous frame) only that
+    region is passed to the detector, scaled down to ``roi_size``, and the
+    landmarks are mapped back to full-frame normalized coordinates. If no
+    pose is found there, the whole frame (scaled down to ``max_side``) is
+    tried instead.
+    """
+    preprocess = inference = 0.0
+    landmarks = None
+    roi_hit = None
+    if roi is not None and preprocessing is not None:
+        start = time.perf_counter()
+        crop, (left, top, crop_width, crop_height) = crop_to_roi(
+            frame_rgb, roi, preprocessing.roi_size,
+        )
+        cropped = time.perf_counter()
+        landmarks = extract_landmark_array(pose_detector, crop)
+        preprocess += cropped - start
+        inference += time.perf_counter() - cropped
+        roi_hit = landmarks is not None
+        if landmarks is not None:
+            landmarks[:, X] = left + landmarks[:, X] * crop_width
+            landmarks[:, Y] = top + landmarks[:, Y] * crop_height
+            # z is on roughly the same scale as x
+            landmarks[:, Z] *= crop_width
+
+    if landmarks is None:
+        start = time.perf_counter()
+        image = scale_down(frame_rgb, preprocessing.max_side if preprocessing else 0)
+        scaled = time.perf_counter()
+        landmarks = extract_landmark_array(pose_detector, image)
+        preprocess += scaled - start
+        inference += time.perf_counter() - scaled
+
+    return landmarks, FrameTimings(0.0, preprocess, inference, roi_hit)
+
+
+def timed_decode(frame_data, preprocessing=None):
+    """decode_frame for ``preprocessing``, also returning how long it took."""
+    start = time.perf_counter()
+    frame_rgb = decode_frame(frame_data, preprocessing.max_side if preprocessing else 0)
+    return frame_rgb, time.perf_counter() - start
+
+
+def decode_and_detect(pose_detector, frame_data, roi=None, preprocessing=None):
+    """
+    timed_decode followed by detect_pose: the whole per-frame pipeline.
+    Returns (landmarks, FrameTimings).
+    """
+    frame_rgb, decode = timed_decode(frame_data, preprocessing)
+    if frame_rgb is None:
+        return None, FrameTimings(decode, 0.0, 0.0, None)
+    landmarks, timings = detect_pose(pose_detector, frame_rgb, roi, preprocessing)
+    return landmarks, timings._replace(decode=decode)
+
+
+def extract_landmark_array(pose_detector, frame_rgb):
     """
     Run MediaPipe PoseLandmarker on an RGB frame.
-    Returns a list of {x, y, z, visibility} dicts for all 33 landmarks, or None.
+    Returns a (33, 4) float32 array of [x, y, z, visibility] rows, or None.
     """
     mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
     result = pose_detector.detect(mp_image)
@@ -78,21 +327,52 @@ def extract_landmarks(pose_detector, frame_rgb):
 
     # result.pose_landmarks is a list of poses; take the first one
     pose = result.pose_landmarks[0]
-    landmarks = []
-    for lm in pose:
-        landmarks.append({
-            "x": lm.x,
-            "y": lm.y,
-            "z": lm.z,
-            "visibility": lm.visibility,
-        })
-    return landmarks
+    return np.array(
+        [(lm.x, lm.y, lm.z, lm.visibility) for lm in pose],
+        dtype=np.float32,
+    )
+
+
+def extract_landmarks(pose_detector, frame_rgb):
+    """
+    Run MediaPipe PoseLandmarker on an RGB frame.
+    Returns a list of {x, y, z, visibility} dicts for all 33 landmarks, or None.
+    """
+    landmarks = extract_landmark_array(pose_detector, frame_rgb)
+    if landmarks is None:
+        return None
+    return array_to_landmarks(landmarks)
+
+
+def as_landmark_array(landmarks):
+    """
+    Return landmarks (list of dicts or array) as an (N, 4) array.
+    Dicts are converted at float64 so averaged values keep their precision.
+    """
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+    return np.array(
+        [(lm["x"], lm["y"], lm["z"], lm["visibility"]) for lm in landmarks],
+        dtype=np.float64,
+    )
+
+
+def array_to_landmarks(landmarks):
+    """Convert an (N, 4) landmark array to a list of {x, y, z, visibility} dicts."""
+    return [
+        {"x": x, "y": y, "z": z, "visibility": visibility}
+        for x, y, z, visibility in landmarks.tolist()
+    ]
 
 
 def get_landmark(landmarks, index):
-    """Get a single landmark dict by index."""
-    if landmarks and 0 <= index < len(landmarks):
-        return landmarks[index]
+    """Get a single landmark dict by index. Accepts dict lists or landmark arrays."""
+    if landmarks is not None and 0 <= index < len(landmarks):
+        lm = landmarks[index]
+        if isinstance(lm, np.ndarray):
+            x, y, z, visibility = lm.tolist()
+            return {"x": x, "y": y, "z": z, "visibility": visibility}
+        return lm
     return None
 
 
@@ -135,19 +415,11 @@ def serialize_posture_landmarks(landmarks):
     Extract only the posture-relevant landmarks for sending to the frontend.
     Returns a dict mapping landmark names to {x, y} for overlay rendering.
     """
-    if not landmarks:
+    if landmarks is None or len(landmarks) == 0:
         return None
 
-    mapping = {
-        "left_ear": LEFT_EAR,
-        "right_ear": RIGHT_EAR,
-        "left_shoulder": LEFT_SHOULDER,
-        "right_shoulder": RIGHT_SHOULDER,
-        "left_hip": LEFT_HIP,
-        "right_hip": RIGHT_HIP,
-    }
     result = {}
-    for name, idx in mapping.items():
+    for name, idx in SERIALIZED_LANDMARKS.items():
         lm = get_landmark(landmarks, idx)
         if lm:
             result[name] = {"x": round(lm["x"], 4), "y": round(lm["y"], 4)}
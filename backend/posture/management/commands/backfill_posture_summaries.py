@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from posture.summaries import rebuild_daily, rebuild_summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Build or rebuild the per-user posture summaries used by the exercise "
+        "recommender and the daily rollups used by the stats endpoint"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Only rebuild these user ids (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(
+            posture_sessions__is_active=False,
+        ).distinct()
+        if options["user_ids"]:
+            users = users.filter(id__in=options["user_ids"])
+
+        count = 0
+        for user in users.iterator():
+            rebuild_summary(user)
+            rebuild_daily(user)
+            count += 1
+            if count % 500 == 0:
+                self.stdout.write(f"  Rebuilt {count} summaries...")
+
+        self.stdout.write(self.style.SUCCESS(f"Done! Rebuilt summaries and daily rollups for {count} users."))
@@ -0,0 +1,178 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.db.models import Avg
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from posture.models import PostureScore, PostureSession
+
+BENCH_USER_PREFIX = "bench-history-"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic posture history and report EXPLAIN plans and timings "
+        "for the history/stats queries with and without the composite indexes "
+        "(inside a transaction that is rolled back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--sessions", type=int, default=60, help="Sessions per user")
+        parser.add_argument("--scores", type=int, default=300, help="Score rows per session")
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        # The seed rows and the index swap in without_indexes() are rolled
+        # back together, so an interrupted run cannot leave the database
+        # without its indexes (DDL is transactional on PostgreSQL and SQLite).
+        # SQLite only allows schema changes in a transaction with foreign
+        # key checks off, and they can only be switched off outside one.
+        with connection.constraint_checks_disabled(), transaction.atomic():
+            self.benchmark(options)
+            transaction.set_rollback(True)
+        self.stdout.write("Rolled back seeded data and index changes.")
+
+    def benchmark(self, options):
+        users = self.seed(options["users"], options["sessions"], options["scores"])
+        self.analyze()
+        user = users[len(users) // 2]
+        session = PostureSession.objects.filter(user=user, is_active=False).first()
+        queries = self.queries(user, session)
+
+        with without_indexes():
+            self.analyze()
+            before = self.run(queries, options["repeat"], "Without composite indexes")
+        self.analyze()
+        after = self.run(queries, options["repeat"], "With composite indexes")
+
+        self.stdout.write("\nSummary (median ms)")
+        for name in queries:
+            self.stdout.write(
+                f"  {name:<18} {before[name]:8.3f} -> {after[name]:8.3f}"
+                f"  ({before[name] / after[name]:.1f}x)"
+            )
+
+    # ── Data ────────────────────────────────────────────────────────
+
+    def seed(self, user_count, sessions_per_user, scores_per_session):
+        User = get_user_model()
+        self.stdout.write(
+            f"Seeding {user_count} users x {sessions_per_user} sessions x "
+            f"{scores_per_session} scores..."
+        )
+        rng = random.Random(0)
+        now = timezone.now()
+        User.objects.bulk_create([
+            User(username=f"{BENCH_USER_PREFIX}{i}") for i in range(user_count)
+        ])
+        users = list(User.objects.filter(username__startswith=BENCH_USER_PREFIX))
+
+        for user in users:
+            sessions = PostureSession.objects.bulk_create([
+                # One session per user is still running
+                PostureSession(user=user, average_score=rng.uniform(40, 95), is_active=i == 0)
+                for i in range(sessions_per_user)
+            ])
+            # started_at is auto_now_add, so spread sessions over 90 days afterwards
+            for session in sessions:
+                session.started_at = now - timedelta(days=rng.uniform(0, 90))
+                session.ended_at = session.started_at + timedelta(seconds=scores_per_session)
+            PostureSession.objects.bulk_update(sessions, ["started_at", "ended_at"], batch_size=500)
+
+            scores = []
+            for session in sessions:
+                for second in range(scores_per_session):
+                    scores.append(PostureScore(
+                        session=session,
+                        timestamp=session.started_at + timedelta(seconds=second),
+                        overall_score=rng.uniform(30, 100),
+                        head_position_score=rng.uniform(30, 100),
+                        shoulder_levelness_score=rng.uniform(30, 100),
+                        shoulder_rounding_score=rng.uniform(30, 100),
+                        spine_alignment_score=rng.uniform(30, 100),
+                        issues=[],
+                    ))
+            PostureScore.objects.bulk_create(scores, batch_size=2000)
+        return users
+    def analyze(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"ANALYZE {PostureSession._meta.db_table}")
+                cursor.execute(f"ANALYZE {PostureScore._meta.db_table}")
+            elif connection.vendor == "sqlite":
+                cursor.execute("ANALYZE")
+
+    # ── Queries ─────────────────────────────────────────────────────
+
+    def queries(self, user, session):
+        """The hot reads as issued by the views and the recommender: (queryset to explain, run)."""
+        finished = PostureSession.objects.filter(user=user, is_active=False)
+        recent = finished.filter(started_at__gte=timezone.now() - timedelta(days=7))
+        daily = (
+            recent.annotate(day=TruncDate("started_at"))
+            .values("day")
+            .annotate(avg=Avg("average_score"))
+            .order_by("day")
+        )
+        session_list = finished[:20]
+        recent_five = finished.order_by("-started_at")[:5]
+        scores = PostureScore.objects.filter(session=session).order_by("timestamp")
+        return {
+            # SessionListView (first page)
+            "session_list": (session_list, lambda: list(session_list.all())),
+            # StatsView
+            "stats_average": (recent, lambda: recent.aggregate(avg_score=Avg("average_score"))),
+            "stats_daily": (daily, lambda: list(daily.all())),
+            # posture.summaries.rebuild_summary
+            "recent_sessions": (recent_five, lambda: list(recent_five.all())),
+            # Session detail scores
+            "session_scores": (scores, lambda: list(scores.all())),
+        }
+
+    def run(self, queries, repeat, title):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n{title}"))
+        medians = {}
+        for name, (queryset, execute) in queries.items():
+            plan = queryset.explain()
+            timings = []
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                execute()
+                timings.append((time.perf_counter() - start) * 1000)
+            medians[name] = statistics.median(timings)
+            self.stdout.write(f"\n{name}: median {medians[name]:.3f} ms")
+            for line in plan.splitlines():
+                self.stdout.write(f"    {line}")
+        return medians
+
+
+@contextmanager
+def without_indexes():
+    """
+    Temporarily restore the pre-index schema (plain FK index on scores).
+    Only run inside a transaction that is rolled back; see Command.handle.
+    """
+    fk_index = models.Index(fields=["session"], name="bench_score_session_fk_idx")
+    with connection.schema_editor() as editor:
+        editor.add_index(PostureScore, fk_index)
+        for index in PostureScore._meta.indexes:
+            editor.remove_index(PostureScore, index)
+        for index in PostureSession._meta.indexes:
+            editor.remove_index(PostureSession, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for index in PostureSession._meta.indexes:
+                editor.add_index(PostureSession, index)
+            for index in PostureScore._meta.indexes:
+                editor.add_index(PostureScore, index)
+            editor.remove_index(PostureScore, fk_index)
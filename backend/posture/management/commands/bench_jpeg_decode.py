@@ -0,0 +1,119 @@
+import statistics
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from posture.landmark_utils import decode_frame, scale_down
+
+RESOLUTIONS = {"480p": (640, 480), "720p": (1280, 720), "1080p": (1920, 1080)}
+
+
+def synthetic_webcam_jpeg(width, height, quality=80, seed=0):
+    """
+    A webcam-like JPEG: smooth lighting, a few soft-edged shapes and sensor
+    noise, so it compresses (and decodes) like a real frame rather than
+    like pure noise.
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    image = np.empty((height, width, 3), np.float32)
+    for channel in range(3):
+        image[..., channel] = 90 + 60 * np.sin(x / width * 3 + channel) * np.cos(y / height * 2)
+    for _ in range(12):
+        center = (int(rng.integers(0, width)), int(rng.integers(0, height)))
+        axes = (int(rng.integers(width // 20, width // 5)), int(rng.integers(height // 20, height // 4)))
+        color = rng.integers(0, 255, 3).tolist()
+        cv2.ellipse(image, center, axes, float(rng.integers(0, 180)), 0, 360, color, -1)
+    image = cv2.GaussianBlur(image, (0, 0), width / 400)
+    image += rng.normal(0, 4, image.shape)
+    image = np.clip(image, 0, 255).astype(np.uint8)
+    ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise CommandError("Could not encode synthetic frame")
+    return encoded.tobytes()
+
+
+def decode_full(data, max_side):
+    """The previous path: full-size decode, a separate RGB copy, then resize."""
+    frame_bgr = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return scale_down(cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB), max_side)
+
+
+def decode_reduced(data, max_side):
+    return scale_down(decode_frame(data, max_side), max_side)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare full-size JPEG decode + RGB copy against reduced-size decode "
+        "with in-place colour conversion (time and allocations per frame)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "images",
+            nargs="*",
+            help="JPEG files captured from real webcams (default: synthetic 480p/720p/1080p)",
+        )
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument(
+            "--max-side",
+            type=int,
+            default=settings.POSE_MAX_FRAME_SIDE,
+            help="Size frames are prepared for (default: POSE_MAX_FRAME_SIDE)",
+        )
+
+    def handle(self, *args, **options):
+        if options["images"]:
+            samples = {}
+            for path in options["images"]:
+                with open(path, "rb") as f:
+                    samples[path] = f.read()
+        else:
+            samples = {
+                name: synthetic_webcam_jpeg(*size) for name, size in RESOLUTIONS.items()
+            }
+
+        max_side = options["max_side"]
+        self.stdout.write(f"Frames prepared for a longer side of {max_side}px")
+        for name, data in samples.items():
+            full = decode_full(data, max_side)
+            reduced = decode_reduced(data, max_side)
+            if full is None or reduced is None:
+                raise CommandError(f"{name}: could not decode")
+            # Mean absolute difference of the resulting detector input
+            difference = np.abs(full.astype(np.int16) - reduced.astype(np.int16)).mean()
+
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"\n{name}: {len(data) / 1024:.0f} KiB -> {reduced.shape[1]}x{reduced.shape[0]}"
+            ))
+            for label, func in (("full + copy", decode_full), ("reduced + in place", decode_reduced)):
+                ms = median_ms(func, data, max_side, options["repeat"])
+                peak = peak_bytes(func, data, max_side)
+                self.stdout.write(
+                    f"  {label:<20} {ms:7.2f} ms/frame   peak {peak / 1024:8.0f} KiB allocated"
+                )
+            self.stdout.write(f"  Mean |difference| of prepared frames: {difference:.2f} / 255")
+
+
+def median_ms(func, data, max_side, repeat):
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func(data, max_side)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def peak_bytes(func, data, max_side):
+    """Peak memory allocated while preparing one frame (NumPy buffers included)."""
+    tracemalloc.start()
+    try:
+        func(data, max_side)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
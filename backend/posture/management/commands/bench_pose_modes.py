@@ -0,0 +1,96 @@
+import statistics
+import time
+
+import cv2
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from posture.landmark_utils import (
+    create_pose_detector,
+    create_video_pose_detector,
+    extract_landmark_array,
+)
+
+
+def read_clip(path, max_frames):
+    """Decode up to ``max_frames`` frames of a video file as RGB arrays."""
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise CommandError(f"Could not open clip {path!r}")
+    frames = []
+    try:
+        while len(frames) < max_frames:
+            ok, frame_bgr = capture.read()
+            if not ok:
+                break
+            frames.append(cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB))
+    finally:
+        capture.release()
+    if not frames:
+        raise CommandError(f"No frames decoded from {path!r}")
+    return frames
+
+
+class Command(BaseCommand):
+    help = (
+        "Report pose detection ms/frame on a recorded clip with IMAGE-mode "
+        "(detect every frame) and VIDEO-mode (tracking) PoseLandmarkers"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("clip", help="Video file, e.g. a screen recording of a session")
+        parser.add_argument("--frames", type=int, default=600)
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=10,
+            help="Leading frames excluded from the timings",
+        )
+
+    def handle(self, *args, **options):
+        frames = read_clip(options["clip"], options["frames"])
+        warmup = min(options["warmup"], len(frames) - 1)
+        self.stdout.write(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+        results = {}
+        for mode, factory in (("IMAGE", create_pose_detector), ("VIDEO", create_video_pose_detector)):
+            detector = factory()
+            try:
+                results[mode] = self.run(detector, frames)
+            finally:
+                detector.close()
+
+        for mode, (timings, landmarks) in results.items():
+            timings = timings[warmup:]
+            detected = sum(lm is not None for lm in landmarks)
+            self.stdout.write(
+                f"  {mode:<6} mean {statistics.mean(timings):7.2f} ms/frame   "
+                f"median {statistics.median(timings):7.2f}   "
+                f"p95 {np.percentile(timings, 95):7.2f}   "
+                f"pose found {detected}/{len(landmarks)}"
+            )
+
+        image_ms = statistics.mean(results["IMAGE"][0][warmup:])
+        video_ms = statistics.mean(results["VIDEO"][0][warmup:])
+        self.stdout.write(f"  VIDEO speedup: {image_ms / video_ms:.2f}x")
+
+        # How far tracked landmarks drift from per-frame detection
+        diffs = [
+            np.abs(a[:, :2] - b[:, :2]).mean()
+            for a, b in zip(results["IMAGE"][1], results["VIDEO"][1])
+            if a is not None and b is not None
+        ]
+        if diffs:
+            self.stdout.write(
+                f"  Mean |dx, dy| between modes: {statistics.mean(diffs):.4f} "
+                f"(normalized image coordinates, {len(diffs)} frames)"
+            )
+
+    def run(self, detector, frames):
+        timings = []
+        landmarks = []
+        for frame in frames:
+            start = time.perf_counter()
+            landmarks.append(extract_landmark_array(detector, frame))
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings, landmarks
@@ -0,0 +1,238 @@
+import math
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from posture.landmark_utils import (
+    LEFT_EAR,
+    LEFT_HIP,
+    LEFT_SHOULDER,
+    NUM_LANDMARKS,
+    RIGHT_EAR,
+    RIGHT_HIP,
+    RIGHT_SHOULDER,
+    VISIBILITY,
+    X,
+    Y,
+    angle_from_vertical,
+    array_to_landmarks,
+    distance_2d,
+    get_landmark,
+    landmarks_visible,
+    midpoint,
+)
+from posture.scoring import (
+    LABEL_CODES,
+    REQUIRED_LANDMARKS,
+    WEIGHTS,
+    CalibrationBaseline,
+    PostureScorer,
+    get_score_label,
+    score_batch,
+)
+
+
+def synthetic_frames(count, seed=0):
+    """Upright-ish upper-body poses with noise and the odd occluded landmark."""
+    rng = np.random.default_rng(seed)
+    frames = rng.random((count, NUM_LANDMARKS, 4)).astype(np.float32)
+    frames[..., VISIBILITY] = rng.choice([0.3, 0.95], size=(count, NUM_LANDMARKS), p=[0.01, 0.99])
+    layout = {
+        LEFT_EAR: (0.45, 0.30), RIGHT_EAR: (0.55, 0.30),
+        LEFT_SHOULDER: (0.38, 0.50), RIGHT_SHOULDER: (0.62, 0.50),
+        LEFT_HIP: (0.41, 0.85), RIGHT_HIP: (0.59, 0.85),
+    }
+    for index, (x, y) in layout.items():
+        frames[:, index, X] = rng.normal(x, 0.04, count)
+        frames[:, index, Y] = rng.normal(y, 0.03, count)
+    return frames
+
+
+def reference_score(landmarks, calibration=None):
+    """
+    The dict-walking PostureScorer.score that the array code replaced,
+    kept to check that single-frame scoring has not become slower. Returns
+    the scores, label and issue components (severity and wording aside).
+    """
+    if not landmarks_visible(landmarks, REQUIRED_LANDMARKS):
+        return None
+
+    def lm(index, source=landmarks):
+        return get_landmark(source, index)
+
+    ear_mid = midpoint(lm(LEFT_EAR), lm(RIGHT_EAR))
+    shoulder_mid = midpoint(lm(LEFT_SHOULDER), lm(RIGHT_SHOULDER))
+    hip_mid = midpoint(lm(LEFT_HIP), lm(RIGHT_HIP))
+    if calibration is not None:
+        cal_ear_mid = midpoint(lm(LEFT_EAR, calibration), lm(RIGHT_EAR, calibration))
+        cal_shoulder_mid = midpoint(lm(LEFT_SHOULDER, calibration), lm(RIGHT_SHOULDER, calibration))
+        cal_hip_mid = midpoint(lm(LEFT_HIP, calibration), lm(RIGHT_HIP, calibration))
+
+    if calibration is not None:
+        y_deviation = abs(
+            (ear_mid["y"] - shoulder_mid["y"]) - (cal_ear_mid["y"] - cal_shoulder_mid["y"])
+        )
+        x_deviation = abs(
+            abs(ear_mid["x"] - shoulder_mid["x"]) - abs(cal_ear_mid["x"] - cal_shoulder_mid["x"])
+        )
+        deviation = math.sqrt(y_deviation**2 + x_deviation**2)
+    else:
+        vertical_dist = abs(ear_mid["y"] - shoulder_mid["y"])
+        deviation = abs(ear_mid["x"] - shoulder_mid["x"]) + max(0, 0.15 - vertical_dist)
+    head = max(0, 100 - (deviation / 0.15) * 100)
+
+    y_diff = abs(lm(LEFT_SHOULDER)["y"] - lm(RIGHT_SHOULDER)["y"])
+    if calibration is not None:
+        deviation = abs(y_diff - abs(lm(LEFT_SHOULDER, calibration)["y"] - lm(RIGHT_SHOULDER, calibration)["y"]))
+    else:
+        deviation = y_diff
+    level = max(0, 100 - (deviation / 0.05) * 100)
+
+    hip_width = distance_2d(lm(LEFT_HIP), lm(RIGHT_HIP))
+    rounding_measurable = hip_width >= 0.01
+    if rounding_measurable:
+        ratio = distance_2d(lm(LEFT_SHOULDER), lm(RIGHT_SHOULDER)) / hip_width
+        ideal_ratio = 1.2
+        if calibration is not None:
+            cal_sw = distance_2d(lm(LEFT_SHOULDER, calibration), lm(RIGHT_SHOULDER, calibration))
+            cal_hw = distance_2d(lm(LEFT_HIP, calibration), lm(RIGHT_HIP, calibration))
+            ideal_ratio = cal_sw / cal_hw if cal_hw > 0.01 else 1.0
+        rounding = max(0, 100 - (max(0, ideal_ratio - ratio) / 0.3) * 100)
+    else:
+        rounding = 50
+
+    deviation = abs(angle_from_vertical(shoulder_mid, hip_mid))
+    if calibration is not None:
+        deviation = abs(deviation - abs(angle_from_vertical(cal_shoulder_mid, cal_hip_mid)))
+    spine = max(0, 100 - (deviation / 15) * 100)
+
+    scores = {
+        "head_position": head,
+        "shoulder_levelness": level,
+        "shoulder_rounding": rounding,
+        "spine_alignment": spine,
+    }
+    overall = sum(scores[c] * weight for c, weight in WEIGHTS.items())
+    overall = round(max(0, min(100, overall)), 1)
+    result = {"overall_score": overall, "label": get_score_label(overall)}
+    for component, score in scores.items():
+        result[f"{component}_score"] = round(score, 1)
+    result["issues"] = [
+        component for component, score in scores.items()
+        if score < 70 and (component != "shoulder_rounding" or rounding_measurable)
+    ]
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-frame PostureScorer.score against vectorized score_batch "
+        "and against the dict-based scorer it replaced"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--frames", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--calibrated",
+            action="store_true",
+            help="Score against a calibration baseline instead of heuristics",
+        )
+
+    def handle(self, *args, **options):
+        frames = synthetic_frames(options["frames"])
+        dict_frames = [array_to_landmarks(f) for f in frames]
+        calibration = baseline = None
+        if options["calibrated"]:
+            calibration = synthetic_frames(1, seed=1)[0]
+            baseline = CalibrationBaseline.from_landmarks(calibration)
+        scorer = PostureScorer(baseline=baseline)
+
+        reference = best_of(
+            options["repeat"], lambda: [reference_score(f, calibration) for f in dict_frames],
+        )
+        single = best_of(options["repeat"], lambda: [scorer.score(f) for f in frames])
+        single_dicts = best_of(options["repeat"], lambda: [scorer.score(f) for f in dict_frames])
+        batch = best_of(options["repeat"], lambda: score_batch(frames, baseline))
+
+        mismatches = compare(single.result, batch.result)
+        if mismatches:
+            raise CommandError(f"{mismatches} frames differ between score and score_batch")
+        mismatches = compare_reference(single_dicts.result, reference.result)
+        if mismatches:
+            raise CommandError(f"{mismatches} frames differ from the dict-based scorer")
+
+        n = len(frames)
+        self.stdout.write(f"Frames:          {n}")
+        for name, timing in [
+            ("dict reference:", reference),
+            ("score(array):", single),
+            ("score(dicts):", single_dicts),
+            ("score_batch():", batch),
+        ]:
+            self.stdout.write(
+                f"{name:<16} {timing.seconds * 1000:8.1f} ms  "
+                f"({timing.seconds / n * 1e6:6.1f} us/frame)"
+            )
+
+        slowest = max(single.seconds, single_dicts.seconds)
+        if slowest > reference.seconds:
+            raise CommandError(
+                f"score() is {slowest / reference.seconds:.2f}x slower per frame "
+                "than the dict-based scorer it replaced"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Results identical; score() is no slower than before, "
+            f"batch is {single.seconds / batch.seconds:.1f}x faster."
+        ))
+
+class Timing:
+    def __init__(self, seconds, result):
+        self.seconds = seconds
+        self.result = result
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best.seconds:
+            best = Timing(elapsed, result)
+    return best
+
+
+def compare(single, batch):
+    """Count frames where the batch columns disagree with per-frame results."""
+    mismatches = 0
+    for i, result in enumerate(single):
+        if result is None:
+            mismatches += bool(batch["scorable"][i])
+            continue
+        expected = [result["overall_score"]] + [result[f"{c}_score"] for c in WEIGHTS]
+        actual = [batch["overall"][i]] + [batch[c][i] for c in WEIGHTS]
+        if (
+            expected != actual
+            or LABEL_CODES[result["label"]] != batch["label"][i]
+            or result["issue_flags"] != batch["issues"][i]
+        ):
+            mismatches += 1
+    return mismatches
+
+
+def compare_reference(single, reference):
+    """Count frames where PostureScorer.score disagrees with reference_score."""
+    mismatches = 0
+    for result, expected in zip(single, reference):
+        if result is None or expected is None:
+            mismatches += (result is None) != (expected is None)
+            continue
+        issues = [issue["component"] for issue in result["issues"]]
+        if (
+            any(result[key] != value for key, value in expected.items() if key != "issues")
+            or issues != expected["issues"]
+        ):
+            mismatches += 1
+    return mismatches
@@ -0,0 +1,136 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from exercises.models import Exercise, ExerciseCategory
+from exercises.serializers import ExerciseRowSerializer, ExerciseSerializer
+from posture.models import PostureScore, PostureSession
+from posture.serializers import (
+    PostureScoreRowSerializer,
+    PostureScoreSerializer,
+    PostureSessionListRowSerializer,
+    PostureSessionListSerializer,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF ModelSerializers with the row fast-path serializers on "
+        "synthetic data (inside a transaction that is rolled back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            for count in options["rows"]:
+                querysets = self.seed(count)
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n{count} rows"))
+                for name, (queryset, model_serializer, row_serializer) in querysets.items():
+                    self.compare(name, queryset, model_serializer, row_serializer, options["repeat"])
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        rng = random.Random(count)
+        user = get_user_model().objects.create(username=f"bench-serializers-{count}")
+        now = timezone.now()
+
+        sessions = PostureSession.objects.bulk_create([
+            PostureSession(
+                user=user,
+                ended_at=now,
+                average_score=rng.uniform(40, 95),
+                is_active=False,
+                score_count=rng.randint(0, 3600),
+            )
+            for _ in range(count)
+        ])
+        session = sessions[0]
+        PostureScore.objects.bulk_create([
+            PostureScore(
+                session=session,
+                timestamp=now + timedelta(seconds=i),
+                overall_score=round(rng.uniform(30, 100), 1),
+                head_position_score=round(rng.uniform(30, 100), 1),
+                shoulder_levelness_score=round(rng.uniform(30, 100), 1),
+                shoulder_rounding_score=round(rng.uniform(30, 100), 1),
+                spine_alignment_score=round(rng.uniform(30, 100), 1),
+                issues=[{
+                    "component": "shoulder_levelness",
+                    "severity": "fair",
+                    "message": "Your left shoulder is higher — try to relax and level your shoulders.",
+                }] if i % 3 == 0 else [],
+            )
+            for i in range(count)
+        ], batch_size=2000)
+
+        category = ExerciseCategory.objects.create(name=f"Bench {count}")
+        Exercise.objects.bulk_create([
+            Exercise(
+                name=f"Bench exercise {count}-{i}",
+                description="Synthetic exercise for serializer benchmarks.",
+                instructions="Sit tall. Breathe. Repeat.",
+                # Some exercises have no category, which DRF renders differently
+                category=category if i % 10 else None,
+                target_issue="general",
+                duration_seconds=60,
+                repetitions=10 if i % 2 else None,
+            )
+            for i in range(count)
+        ], batch_size=2000)
+
+        return {
+            "PostureScore": (
+                PostureScore.objects.filter(session=session),
+                PostureScoreSerializer,
+                PostureScoreRowSerializer,
+            ),
+            "PostureSessionList": (
+                PostureSession.objects.filter(user=user, is_active=False),
+                PostureSessionListSerializer,
+                PostureSessionListRowSerializer,
+            ),
+            "Exercise": (
+                Exercise.objects.filter(name__startswith=f"Bench exercise {count}-")
+                .select_related("category"),
+                ExerciseSerializer,
+                ExerciseRowSerializer,
+            ),
+        }
+
+    def compare(self, name, queryset, model_serializer, row_serializer, repeat):
+        renderer = JSONRenderer()
+
+        def drf():
+            return renderer.render(model_serializer(queryset.all(), many=True).data)
+
+        def fast():
+            return renderer.render(row_serializer.serialize(row_serializer.values(queryset.all())))
+
+        if drf() != fast():
+            raise CommandError(f"{name}: row serializer output differs from {model_serializer.__name__}")
+
+        drf_ms = median_ms(drf, repeat)
+        fast_ms = median_ms(fast, repeat)
+        self.stdout.write(
+            f"  {name:<20} DRF {drf_ms:9.1f} ms   rows {fast_ms:9.1f} ms   "
+            f"{drf_ms / fast_ms:5.1f}x  (identical JSON)"
+        )
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
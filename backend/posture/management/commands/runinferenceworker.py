@@ -0,0 +1,33 @@
+from channels import DEFAULT_CHANNEL_LAYER
+from channels.management.commands.runworker import Command as RunWorkerCommand
+from django.conf import settings
+
+from posture.detector_pool import get_detector_pool
+
+
+class Command(RunWorkerCommand):
+    help = (
+        "Run a pose inference worker (PoseInferenceConsumer) on "
+        "POSE_INFERENCE_CHANNEL, loading its detectors before taking frames"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--layer",
+            action="store",
+            dest="layer",
+            default=DEFAULT_CHANNEL_LAYER,
+            help="Channel layer alias to use, if not the default.",
+        )
+        parser.add_argument(
+            "channels",
+            nargs="*",
+            help="Channels to listen on (default: POSE_INFERENCE_CHANNEL)",
+        )
+
+    def handle(self, *args, **options):
+        options["channels"] = options["channels"] or [settings.POSE_INFERENCE_CHANNEL]
+        # Frames are detected with the shared IMAGE-mode pool (see
+        # PoseInferenceConsumer); load it now rather than on the first frame
+        get_detector_pool().warm(settings.POSE_DETECTOR_POOL_WARM)
+        super().handle(*args, **options)
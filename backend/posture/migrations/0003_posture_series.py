@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posture", "0002_score_timestamp_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostureSeries",
+            fields=[
+                (
+                    "session",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="series",
+                        serialize=False,
+                        to="posture.posturesession",
+                    ),
+                ),
+                ("sample_count", models.PositiveIntegerField(default=0)),
+                ("samples", models.BinaryField(default=bytes)),
+                ("rollups", models.JSONField(blank=True, default=dict)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posture", "0003_posture_series"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posturesession",
+            name="stats",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posture", "0005_user_posture_summary"),
+    ]
+
+    # The composite score index is created before the plain session index is
+    # dropped, so score lookups are never left unindexed.
+    operations = [
+        migrations.AddIndex(
+            model_name="posturescore",
+            index=models.Index(
+                fields=["session", "timestamp"],
+                name="posture_score_session_ts_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="posturescore",
+            name="session",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="scores",
+                to="posture.posturesession",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="posturesession",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["user", "-started_at"],
+                name="posture_session_user_done_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:11
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_score_count(apps, schema_editor):
+    PostureSession = apps.get_model("posture", "PostureSession")
+    PostureScore = apps.get_model("posture", "PostureScore")
+    PostureSeries = apps.get_model("posture", "PostureSeries")
+
+    row_counts = (
+        PostureScore.objects.filter(session=OuterRef("pk"))
+        .order_by()
+        .values("session")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    sample_counts = PostureSeries.objects.filter(session=OuterRef("pk")).values("sample_count")
+    PostureSession.objects.update(
+        score_count=Coalesce(
+            Subquery(sample_counts, output_field=IntegerField()),
+            Subquery(row_counts, output_field=IntegerField()),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posture", "0006_history_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posturesession",
+            name="score_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_score_count, migrations.RunPython.noop),
+    ]
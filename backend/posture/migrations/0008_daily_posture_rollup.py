@@ -0,0 +1,73 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def backfill_daily_rollups(apps, schema_editor):
+    PostureSession = apps.get_model("posture", "PostureSession")
+    DailyPostureRollup = apps.get_model("posture", "DailyPostureRollup")
+
+    rollups = {}
+    sessions = PostureSession.objects.filter(is_active=False).values_list(
+        "user_id", "started_at", "ended_at", "average_score",
+    )
+    for user_id, started_at, ended_at, average_score in sessions.iterator():
+        key = (user_id, timezone.localdate(started_at))
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = DailyPostureRollup(user_id=user_id, date=key[1])
+        rollup.session_count += 1
+        if average_score is not None:
+            rollup.scored_session_count += 1
+            rollup.score_sum += average_score
+        if ended_at is not None:
+            rollup.duration_seconds += max((ended_at - started_at).total_seconds(), 0)
+    DailyPostureRollup.objects.bulk_create(rollups.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posture", "0007_session_score_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyPostureRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("session_count", models.PositiveIntegerField(default=0)),
+                ("scored_session_count", models.PositiveIntegerField(default=0)),
+                ("score_sum", models.FloatField(default=0)),
+                ("duration_seconds", models.FloatField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_posture_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyposturerollup",
+            constraint=models.UniqueConstraint(
+                fields=("user", "date"), name="posture_daily_user_date_uniq"
+            ),
+        ),
+        migrations.RunPython(backfill_daily_rollups, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class PostureSession(models.Model):
@@ -12,10 +13,24 @@ class PostureSession(models.Model):
     ended_at = models.DateTimeField(null=True, blank=True)
     average_score = models.FloatField(null=True, blank=True)
     calibration_data = models.JSONField(default=dict, blank=True)
+    # Aggregates collected while the session ran (see posture.session_stats)
+    stats = models.JSONField(default=dict, blank=True)
+    # Number of stored scores (PostureScore rows or series samples), set when
+    # the session is finalized so listings don't have to count rows
+    score_count = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
 
     class Meta:
         ordering = ["-started_at"]
+        indexes = [
+            # History, stats and recommendations: a user's finished sessions
+            # filtered or ordered by start time
+            models.Index(
+                fields=["user", "-started_at"],
+                condition=models.Q(is_active=False),
+                name="posture_session_user_done_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Session {self.id} - {self.user.username} ({self.started_at:%Y-%m-%d %H:%M})"
@@ -26,8 +41,10 @@ class PostureScore(models.Model):
         PostureSession,
         on_delete=models.CASCADE,
         related_name="scores",
+        db_index=False,  # covered by posture_score_session_ts_idx
     )
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the score is computed, not when a buffered batch is written
+    timestamp = models.DateTimeField(default=timezone.now)
     overall_score = models.FloatField()
     head_position_score = models.FloatField()
     shoulder_levelness_score = models.FloatField()
@@ -37,6 +54,88 @@ class PostureScore(models.Model):
 
     class Meta:
         ordering = ["timestamp"]
+        indexes = [
+            # Scores are always read per session in time order
+            models.Index(fields=["session", "timestamp"], name="posture_score_session_ts_idx"),
+        ]
 
     def __str__(self):
         return f"Score {self.overall_score:.1f} @ {self.timestamp:%H:%M:%S}"
+
+
+class PostureSeries(models.Model):
+    """
+    A session's scores packed into one fixed-width binary blob (see
+    posture.series), used instead of PostureScore rows when
+    POSTURE_SCORE_STORAGE is "series".
+    """
+
+    session = models.OneToOneField(
+        PostureSession,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="series",
+    )
+    sample_count = models.PositiveIntegerField(default=0)
+    samples = models.BinaryField(default=bytes)
+    rollups = models.JSONField(default=dict, blank=True)
+
+    def __str__(self):
+        return f"Series for session {self.session_id} ({self.sample_count} samples)"
+
+
+class UserPostureSummary(models.Model):
+    """
+    Per-user component averages over the most recent finished sessions,
+    updated as each session ends (see posture.summaries).
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="posture_summary",
+    )
+    # [{"id", "started_at", "count", "sums": {component: total}}], newest first
+    recent_sessions = models.JSONField(default=list, blank=True)
+    # {component: average score}
+    component_averages = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Posture summary for {self.user}"
+
+
+class DailyPostureRollup(models.Model):
+    """
+    Per-user, per-day totals over finished sessions (by the day a session
+    started), updated as each session ends (see posture.summaries). The
+    stats endpoint reads these instead of aggregating sessions.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="daily_posture_rollups",
+    )
+    date = models.DateField()
+    session_count = models.PositiveIntegerField(default=0)
+    # Sessions with an average score, and the sum of those averages
+    scored_session_count = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0)
+    duration_seconds = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ["date"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "date"], name="posture_daily_user_date_uniq"),
+        ]
+
+    @property
+    def average_score(self):
+        if not self.scored_session_count:
+            return None
+        return self.score_sum / self.scored_session_count
+
+    def __str__(self):
+        return f"{self.user} on {self.date}: {self.session_count} sessions"
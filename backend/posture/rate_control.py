@@ -0,0 +1,189 @@
+"""
+Server-driven capture rate control.
+
+Each session has a RateController that watches how long its frames take
+(queueing plus inference), how many it had to drop, and how loaded the
+whole node is, and moves the session up or down a ladder of capture
+settings. The consumer sends the current step to the client as a
+``rate_control`` message and throttles its own frame loop to the same
+rate, so an overloaded node sheds work by asking every client for fewer,
+smaller frames instead of letting latency build for everyone.
+"""
+
+import math
+import time
+from dataclasses import asdict, dataclass
+
+from posture_project import metrics
+
+
+@dataclass(frozen=True)
+class RateLevel:
+    fps: float
+    jpeg_quality: float
+    max_width: int
+
+    def as_message(self, reason):
+        return {"type": "rate_control", **asdict(self), "reason": reason}
+
+
+# Best first. Frame rate goes first, then JPEG quality, then resolution,
+# since scoring is least sensitive to the frame rate.
+LEVELS = (
+    RateLevel(fps=15, jpeg_quality=0.7, max_width=640),
+    RateLevel(fps=12, jpeg_quality=0.7, max_width=640),
+    RateLevel(fps=10, jpeg_quality=0.6, max_width=640),
+    RateLevel(fps=8, jpeg_quality=0.6, max_width=480),
+    RateLevel(fps=5, jpeg_quality=0.5, max_width=480),
+    RateLevel(fps=3, jpeg_quality=0.5, max_width=320),
+)
+
+# Weight of the newest sample in the session latency average
+SMOOTHING = 0.2
+
+# Time constant, in seconds, of the node utilization average
+LOAD_TIME_CONSTANT = 2.0
+
+# Share of an interval's frames that may be dropped (expired before they
+# were processed, or refused by a busy backend) before it counts against
+# the session. Frames coalesced by the mailbox are not counted: the frame
+# loop itself throttles to the advertised rate, so a client sending faster
+# than that coalesces on every window whatever the load.
+MAX_DROPPED_SHARE = 0.1
+
+
+class NodeLoad:
+    """
+    How busy this process's inference capacity is: the time-weighted moving
+    average of frames in inference divided by ``capacity`` (None when the
+    backend cannot tell, e.g. remote workers), plus when it last refused a
+    frame. The average keeps decaying while nothing is in flight, so an
+    idle node reads as idle.
+
+    Only touched from the event loop, so it needs no lock.
+    """
+
+    def __init__(self):
+        self.inflight = 0
+        self.capacity = None
+        self._utilization = 0.0
+        self._updated = time.monotonic()
+        self.last_busy = 0.0
+
+    def _advance(self, now):
+        # Average in the level held since the last change
+        if self.capacity:
+            weight = 1 - math.exp(-max(0.0, now - self._updated) / LOAD_TIME_CONSTANT)
+            self._utilization += weight * (self.inflight / self.capacity - self._utilization)
+            metrics.set_gauge("posture.node_utilization", round(self._utilization, 3))
+        self._updated = now
+
+    def utilization(self, now=None):
+        self._advance(time.monotonic() if now is None else now)
+        return self._utilization
+
+    def begin(self, capacity, now=None):
+        self._advance(time.monotonic() if now is None else now)
+        self.capacity = capacity
+        self.inflight += 1
+
+    def end(self, now=None):
+        self._advance(time.monotonic() if now is None else now)
+        self.inflight -= 1
+
+    def mark_busy(self, now=None):
+        self.last_busy = time.monotonic() if now is None else now
+
+
+node_load = NodeLoad()
+
+
+class RateController:
+    """
+    Picks a session's RateLevel. Every ``interval`` seconds it steps down if
+    the session's frames took longer than ``target_latency`` on average,
+    more than MAX_DROPPED_SHARE of its frames were dropped, the node
+    refused a frame, or node utilization is above
+    ``high_load``. It steps back up only after two calm intervals in a row
+    (fast frames, nothing dropped, utilization below ``low_load``).
+    """
+
+    def __init__(
+        self,
+        target_latency,
+        interval=2.0,
+        high_load=0.9,
+        low_load=0.6,
+        max_fps=0,
+        node=node_load,
+    ):
+        self.target_latency = target_latency
+        self.interval = interval
+        self.high_load = high_load
+        self.low_load = low_load
+        self.node = node
+        # Never advertise more than the server will process
+        self.levels = [level for level in LEVELS if not max_fps or level.fps <= max_fps]
+        if not self.levels:
+            self.levels = [RateLevel(max_fps, LEVELS[-1].jpeg_quality, LEVELS[-1].max_width)]
+        self.index = 0
+        self.latency = None
+        self.processed = 0
+        self.dropped = 0
+        self.calm_intervals = 0
+        self.window_started = time.monotonic()
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def record_frame(self, latency):
+        """A frame was processed ``latency`` seconds after it arrived."""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += SMOOTHING * (latency - self.latency)
+        self.processed += 1
+
+    def record_dropped(self, count=1):
+        """Frames were dropped (expired or refused) without being processed."""
+        self.dropped += count
+
+    def update(self, now=None):
+        """Re-evaluate once per interval. Returns (level, reason) on a change, else None."""
+        now = time.monotonic() if now is None else now
+        if now - self.window_started < self.interval:
+            return None
+
+        busy = self.node.last_busy > self.window_started
+        utilization = self.node.utilization(now)
+        overloaded = utilization > self.high_load
+        slow = self.latency is not None and self.latency > self.target_latency
+        dropped = self.dropped > MAX_DROPPED_SHARE * (self.processed + self.dropped)
+        self.window_started = now
+        self.processed = self.dropped = 0
+
+        if slow or dropped or busy or overloaded:
+            self.calm_intervals = 0
+            if self.index + 1 < len(self.levels):
+                self.index += 1
+                # Judge the new level on its own frames
+                self.latency = None
+                metrics.incr("posture.rate_decreases")
+                reason = "node_busy" if busy or overloaded else "slow" if slow else "dropped_frames"
+                return self.level, reason
+            return None
+
+        calm = (
+            self.latency is not None
+            and self.latency < self.target_latency / 2
+            and utilization < self.low_load
+        )
+        self.calm_intervals = self.calm_intervals + 1 if calm else 0
+        if self.calm_intervals >= 2 and self.index > 0:
+            self.calm_intervals = 0
+            self.index -= 1
+            self.latency = None
+            metrics.incr("posture.rate_increases")
+            return self.level, "recovered"
+        return None
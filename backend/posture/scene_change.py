@@ -0,0 +1,72 @@
+"""
+Scene-change gating for the live frame loop.
+
+A user sitting still sends near-identical frames, and each would otherwise
+run full pose inference. Before inferring, the consumer makes a tiny
+grayscale thumbnail of the frame (a 1/8-scale JPEG decode only reads the
+DC coefficients, so it costs a fraction of a full decode) and compares it
+with the thumbnail of the last frame it actually ran inference on. When
+they barely differ, the previous landmarks and score are reused instead.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+from .landmark_utils import jpeg_bytes
+
+# Thumbnails are scaled to this (width, height) so frames captured at
+# different sizes (see rate_control) still compare
+THUMBNAIL_SIZE = (40, 30)
+
+# A thumbnail pixel only counts as changed when it moves by more than this
+# (out of 255). Sensor noise, JPEG quality changes and small exposure shifts
+# stay well below it at 1/8 scale; an edge moving a few pixels does not.
+PIXEL_DELTA = 8
+
+
+def frame_thumbnail(frame_data):
+    """A small grayscale thumbnail of a JPEG frame, or None if it cannot be decoded."""
+    data = jpeg_bytes(frame_data)
+    gray = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if gray is None:
+        return None
+    return cv2.resize(gray, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+
+
+def thumbnail_difference(a, b):
+    """Share of thumbnail pixels (0 to 1) that changed by more than PIXEL_DELTA."""
+    return np.count_nonzero(cv2.absdiff(a, b) > PIXEL_DELTA) / a.size
+
+
+class SceneChangeGate:
+    """
+    Decides whether a frame differs enough from the last inferred one to be
+    worth inferring. A frame counts as unchanged when less than ``threshold``
+    of its thumbnail's pixels changed since the reference, but never
+    more than ``refresh_interval`` seconds after the reference was taken, so
+    slow drift and stale results are still picked up.
+    """
+
+    def __init__(self, threshold, refresh_interval):
+        self.threshold = threshold
+        self.refresh_interval = refresh_interval
+        self.reference = None
+        self.reference_time = 0.0
+
+    def unchanged(self, thumbnail, now=None):
+        if thumbnail is None or self.reference is None:
+            return False
+        now = time.monotonic() if now is None else now
+        if now - self.reference_time >= self.refresh_interval:
+            return False
+        return thumbnail_difference(thumbnail, self.reference) < self.threshold
+
+    def update(self, thumbnail, now=None):
+        """Make ``thumbnail`` (of a frame that was just inferred) the reference."""
+        self.reference = thumbnail
+        self.reference_time = time.monotonic() if now is None else now
+
+    def reset(self):
+        self.reference = None
@@ -0,0 +1,199 @@
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import IntegrityError, InterfaceError, OperationalError, close_old_connections
+from django.utils import timezone
+
+from posture_project import metrics
+
+from .models import PostureScore, PostureSession
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreBuffer:
+    """
+    Process-wide write-behind buffer for PostureScore rows.
+
+    Consumers ``add`` scores without touching the database; a background
+    thread writes them with ``bulk_create`` once ``flush_rows`` are pending
+    or every ``flush_interval`` seconds, whichever comes first. ``flush``
+    writes everything pending right away (used at session end).
+
+    The buffer holds at most ``max_rows`` scores. If the database falls that
+    far behind, the oldest pending scores are dropped rather than letting
+    memory grow without bound.
+
+    A failed write loses as little as possible: rows of sessions deleted
+    while their scores were pending are dropped and the rest retried, and
+    on a connection error every row goes back to the front of the buffer
+    for the next flush.
+    """
+
+    def __init__(self, max_rows, flush_rows, flush_interval):
+        self.max_rows = max(1, max_rows)
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = flush_interval
+        self._rows = deque()
+        self._cond = threading.Condition()
+        # Held for the whole take-and-write, so flush() returns only once
+        # rows taken by the background thread are committed too
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+    def add(self, session_id, result):
+        """Queue one scoring result for ``session_id``. Never blocks on the DB."""
+        row = PostureScore(
+            session_id=session_id,
+            timestamp=timezone.now(),
+            overall_score=result["overall_score"],
+            head_position_score=result["head_position_score"],
+            shoulder_levelness_score=result["shoulder_levelness_score"],
+            shoulder_rounding_score=result["shoulder_rounding_score"],
+            spine_alignment_score=result["spine_alignment_score"],
+            issues=result["issues"],
+        )
+        with self._cond:
+            if len(self._rows) >= self.max_rows:
+                self._rows.popleft()
+                metrics.incr("score_buffer.dropped")
+            self._rows.append(row)
+            metrics.set_gauge("score_buffer.depth", len(self._rows))
+            if not self._closed:
+                self._start()
+            if len(self._rows) >= self.flush_rows:
+                self._cond.notify()
+
+    def flush(self):
+        """
+        Write every pending score now. Safe to call from any sync thread.
+        Returns False if the rows were put back to retry later.
+        """
+        with self._flush_lock:
+            with self._cond:
+                rows = list(self._rows)
+                self._rows.clear()
+                metrics.set_gauge("score_buffer.depth", 0)
+            if rows:
+                return self._write(rows)
+            return True
+
+    def close(self):
+        """Stop the background thread and write what is left."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _start(self):
+        # Caller must hold self._cond
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="score-buffer", daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and len(self._rows) < self.flush_rows:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                closed = self._closed
+            close_old_connections()
+            try:
+                written = self.flush()
+            finally:
+                close_old_connections()
+            if closed:
+                return
+            if not written:
+                # Give the database a full interval before retrying, even
+                # if flush_rows are already pending again
+                with self._cond:
+                    self._cond.wait_for(lambda: self._closed, self.flush_interval)
+
+    def _write(self, rows):
+        start = time.perf_counter()
+        try:
+            try:
+                self._insert(rows)
+            except IntegrityError:
+                # Typically a session deleted (with its account) while its
+                # scores were pending; keep every other session's rows
+                rows = self._without_deleted_sessions(rows)
+                self._insert(rows)
+        except (OperationalError, InterfaceError):
+            logger.warning(
+                "Failed to write %d buffered posture scores, will retry", len(rows),
+                exc_info=True,
+            )
+            self._requeue(rows)
+            return False
+        except Exception:
+            logger.exception("Failed to write %d buffered posture scores", len(rows))
+            metrics.incr("score_buffer.failed_rows", len(rows))
+            return True
+        metrics.observe("score_buffer.flush", time.perf_counter() - start)
+        metrics.incr("score_buffer.rows_written", len(rows))
+        return True
+
+    def _insert(self, rows):
+        # A failed bulk_create can leave primary keys set on rows from
+        # batches that were rolled back; clear them so a retry inserts anew
+        for row in rows:
+            row.pk = None
+        PostureScore.objects.bulk_create(rows, batch_size=self.flush_rows)
+
+    def _without_deleted_sessions(self, rows):
+        session_ids = {row.session_id for row in rows}
+        existing = set(
+            PostureSession.objects.filter(pk__in=session_ids).values_list("pk", flat=True)
+        )
+        kept = [row for row in rows if row.session_id in existing]
+        if len(kept) < len(rows):
+            logger.warning(
+                "Dropped %d buffered posture scores of deleted sessions %s",
+                len(rows) - len(kept), sorted(session_ids - existing),
+            )
+            metrics.incr("score_buffer.failed_rows", len(rows) - len(kept))
+        return kept
+
+    def _requeue(self, rows):
+        """Put ``rows`` back ahead of newer pending rows, keeping the max_rows bound."""
+        with self._cond:
+            self._rows.extendleft(reversed(rows))
+            while len(self._rows) > self.max_rows:
+                self._rows.popleft()
+                metrics.incr("score_buffer.dropped")
+            metrics.set_gauge("score_buffer.depth", len(self._rows))
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_score_buffer():
+    """Return the process-wide score buffer, creating it on first use."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = ScoreBuffer(
+                    max_rows=settings.POSTURE_SCORE_BUFFER_MAX_ROWS,
+                    flush_rows=settings.POSTURE_SCORE_FLUSH_ROWS,
+                    flush_interval=settings.POSTURE_SCORE_FLUSH_INTERVAL,
+                )
+                atexit.register(_buffer.close)
+    return _buffer
@@ -1,17 +1,21 @@
 import math
+from dataclasses import dataclass
+
+import numpy as np
 
 from .landmark_utils import (
     LEFT_EAR,
     LEFT_HIP,
     LEFT_SHOULDER,
+    NUM_LANDMARKS,
     RIGHT_EAR,
     RIGHT_HIP,
     RIGHT_SHOULDER,
-    angle_from_vertical,
-    distance_2d,
-    get_landmark,
-    landmarks_visible,
-    midpoint,
+    SERIALIZED_LANDMARKS,
+    VISIBILITY,
+    X,
+    Y,
+    as_landmark_array,
 )
 
 # Weights for overall score
@@ -38,6 +42,25 @@ SCORE_RANGES = [
     (0, 39, "poor"),
 ]
 
+# Component scores below this raise an issue
+ISSUE_THRESHOLD = 70
+
+ISSUE_MESSAGES = {
+    "head_position": "Head is forward of ideal position — try tucking your chin back.",
+    "shoulder_levelness": "Your {side} shoulder is higher — try to relax and level your shoulders.",
+    "shoulder_rounding": "Shoulders appear rounded — pull your shoulder blades back and together.",
+    "spine_alignment": "Your torso is leaning to one side — sit or stand upright.",
+}
+
+# Issue bitmask used by batch scoring: one bit per component, in WEIGHTS order,
+# plus a flag saying which shoulder the levelness issue refers to
+ISSUE_BITS = {component: 1 << i for i, component in enumerate(WEIGHTS)}
+LEFT_SHOULDER_HIGHER = 1 << len(WEIGHTS)
+
+# Batch scoring reports labels as indices into LABELS (-1 = not scorable)
+LABELS = tuple(label for _, _, label in SCORE_RANGES)
+LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+
 
 def get_score_label(score):
     for low, high, label in SCORE_RANGES:
@@ -46,16 +69,398 @@ def get_score_label(score):
     return "poor"
 
 
+def label_codes(scores):
+    """Vectorized get_score_label, returning codes that index into LABELS."""
+    scores = np.asarray(scores)
+    codes = np.full(scores.shape, LABEL_CODES["poor"], dtype=np.int8)
+    for low, high, label in SCORE_RANGES:
+        codes[(scores >= low) & (scores <= high)] = LABEL_CODES[label]
+    return codes
+
+
+def round_scores(values):
+    """
+    Round to one decimal place elementwise, matching Python's round(x, 1).
+
+    np.round scales by 10 before rounding, which can land on the other side
+    of a .x5 tie than Python's correctly-rounded result; those few values
+    are re-rounded with round().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, 1)
+    scaled = values * 10
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(v, 1) for v in values[near_tie].tolist()]
+    return rounded
+
+
+def posture_geometry(landmarks):
+    """
+    Measure the posture features used for scoring.
+
+    ``landmarks`` is a (..., 33, 4) array; every returned value is an array
+    of the leading shape, so a single frame and a stack of frames go through
+    the same code.
+    """
+    lm = np.asarray(landmarks, dtype=np.float64)
+
+    ear_mid_x = (lm[..., LEFT_EAR, X] + lm[..., RIGHT_EAR, X]) / 2
+    ear_mid_y = (lm[..., LEFT_EAR, Y] + lm[..., RIGHT_EAR, Y]) / 2
+    shoulder_mid_x = (lm[..., LEFT_SHOULDER, X] + lm[..., RIGHT_SHOULDER, X]) / 2
+    shoulder_mid_y = (lm[..., LEFT_SHOULDER, Y] + lm[..., RIGHT_SHOULDER, Y]) / 2
+    hip_mid_x = (lm[..., LEFT_HIP, X] + lm[..., RIGHT_HIP, X]) / 2
+    hip_mid_y = (lm[..., LEFT_HIP, Y] + lm[..., RIGHT_HIP, Y]) / 2
+
+    shoulder_dy = lm[..., LEFT_SHOULDER, Y] - lm[..., RIGHT_SHOULDER, Y]
+    shoulder_width = np.sqrt(
+        (lm[..., LEFT_SHOULDER, X] - lm[..., RIGHT_SHOULDER, X]) ** 2 + shoulder_dy ** 2
+    )
+    hip_width = np.sqrt(
+        (lm[..., LEFT_HIP, X] - lm[..., RIGHT_HIP, X]) ** 2
+        + (lm[..., LEFT_HIP, Y] - lm[..., RIGHT_HIP, Y]) ** 2
+    )
+
+    # Angle of the hip→shoulder line from vertical (y increases downward)
+    torso_angle = np.abs(np.degrees(np.arctan2(
+        shoulder_mid_x - hip_mid_x,
+        -(shoulder_mid_y - hip_mid_y),
+    )))
+
+    return {
+        "head_offset_x": np.abs(ear_mid_x - shoulder_mid_x),
+        "head_offset_y": ear_mid_y - shoulder_mid_y,
+        "shoulder_dy": shoulder_dy,
+        "shoulder_width": shoulder_width,
+        "hip_width": hip_width,
+        "torso_angle": torso_angle,
+    }
+
+
+@dataclass(frozen=True)
+class CalibrationBaseline:
+    """
+    The calibrated ideal pose, reduced once to the handful of measurements
+    scoring compares against. Immutable, so one baseline can be shared by
+    any number of scorers and sessions.
+    """
+
+    head_offset_x: float
+    head_offset_y: float
+    shoulder_diff: float
+    shoulder_hip_ratio: float
+    torso_angle: float
+
+    @classmethod
+    def from_landmarks(cls, landmarks):
+        """Compile a baseline from calibration landmarks (array or dicts)."""
+        lm = as_landmark_array(landmarks)
+        g = posture_geometry(lm)
+        hip_width = g["hip_width"]
+        ratio = np.where(
+            hip_width > 0.01,
+            g["shoulder_width"] / np.where(hip_width > 0.01, hip_width, 1.0),
+            1.0,
+        )
+        fields = {
+            "head_offset_x": g["head_offset_x"],
+            "head_offset_y": g["head_offset_y"],
+            "shoulder_diff": np.abs(g["shoulder_dy"]),
+            "shoulder_hip_ratio": ratio,
+            "torso_angle": g["torso_angle"],
+        }
+        if lm.ndim == 2:
+            # A single pose: plain floats keep PostureScorer.score off NumPy
+            fields = {name: float(value) for name, value in fields.items()}
+        return cls(**fields)
+
+    @classmethod
+    def from_session_data(cls, calibration_data):
+        """
+        Rebuild a baseline from ``PostureSession.calibration_data`` (the
+        serialized {name: {x, y}} landmarks). Returns None if the session
+        was never calibrated.
+        """
+        if not calibration_data or any(
+            name not in calibration_data for name in SERIALIZED_LANDMARKS
+        ):
+            return None
+        landmarks = np.zeros((NUM_LANDMARKS, 4))
+        for name, index in SERIALIZED_LANDMARKS.items():
+            landmarks[index, X] = calibration_data[name]["x"]
+            landmarks[index, Y] = calibration_data[name]["y"]
+        return cls.from_landmarks(landmarks)
+
+
+def component_scores(geometry, baseline=None):
+    """
+    Compute the four 0-100 component scores from ``posture_geometry`` output.
+
+    ``baseline`` is the CalibrationBaseline to compare against, or None to
+    score against geometric heuristics. Returns unrounded score arrays plus
+    ``rounding_measurable``, which is False where the hips are too close
+    together to judge shoulder rounding (that score is then a neutral 50).
+    """
+    g = geometry
+
+    # Head position: ear midpoint offset from shoulder midpoint
+    if baseline is not None:
+        y_deviation = np.abs(g["head_offset_y"] - baseline.head_offset_y)
+        x_deviation = np.abs(g["head_offset_x"] - baseline.head_offset_x)
+        deviation = np.sqrt(y_deviation ** 2 + x_deviation ** 2)
+    else:
+        # Ideal: ears directly above shoulders, good vertical separation
+        vertical_dist = np.abs(g["head_offset_y"])
+        deviation = g["head_offset_x"] + np.maximum(0, 0.15 - vertical_dist)
+    # Max deviation ~0.15 normalized coords
+    head = np.maximum(0, 100 - (deviation / 0.15) * 100)
+
+    # Shoulder levelness: Y difference between the shoulders
+    y_diff = np.abs(g["shoulder_dy"])
+    if baseline is not None:
+        deviation = np.abs(y_diff - baseline.shoulder_diff)
+    else:
+        deviation = y_diff
+    # Max tolerable deviation ~0.05 in normalized coords
+    level = np.maximum(0, 100 - (deviation / 0.05) * 100)
+
+    # Shoulder rounding: shoulder width relative to hip width
+    measurable = g["hip_width"] >= 0.01
+    ratio = g["shoulder_width"] / np.where(measurable, g["hip_width"], 1.0)
+    if baseline is not None:
+        ideal_ratio = baseline.shoulder_hip_ratio
+    else:
+        # Good posture: shoulders wider than hips (ratio ~1.1-1.3)
+        ideal_ratio = 1.2
+    deviation = np.maximum(0, ideal_ratio - ratio)  # rounding decreases ratio
+    # Max deviation ~0.3
+    rounding = np.where(measurable, np.maximum(0, 100 - (deviation / 0.3) * 100), 50.0)
+
+    # Spine alignment: torso midline angle from vertical
+    if baseline is not None:
+        deviation = np.abs(g["torso_angle"] - baseline.torso_angle)
+    else:
+        deviation = g["torso_angle"]  # ideal is 0 degrees (vertical)
+    # Max tolerable deviation ~15 degrees
+    spine = np.maximum(0, 100 - (deviation / 15) * 100)
+
+    overall = (
+        head * WEIGHTS["head_position"]
+        + level * WEIGHTS["shoulder_levelness"]
+        + rounding * WEIGHTS["shoulder_rounding"]
+        + spine * WEIGHTS["spine_alignment"]
+    )
+
+    return {
+        "overall": np.clip(overall, 0, 100),
+        "head_position": head,
+        "shoulder_levelness": level,
+        "shoulder_rounding": rounding,
+        "spine_alignment": spine,
+        "rounding_measurable": measurable,
+    }
+
+
+def landmarks_scorable(landmarks, min_visibility=0.5):
+    """True where every landmark required for scoring is visible enough."""
+    visibility = np.asarray(landmarks)[..., REQUIRED_LANDMARKS, VISIBILITY]
+    return (visibility >= min_visibility).all(axis=-1)
+
+
+def issue_flags(landmarks, scores):
+    """Issue bitmask (see ISSUE_BITS) for ``component_scores`` output."""
+    flags = np.zeros(np.shape(scores["overall"]), dtype=np.uint8)
+    for component, bit in ISSUE_BITS.items():
+        flagged = scores[component] < ISSUE_THRESHOLD
+        if component == "shoulder_rounding":
+            flagged = flagged & scores["rounding_measurable"]
+        flags[flagged] |= bit
+
+    lm = np.asarray(landmarks)
+    left_higher = lm[..., LEFT_SHOULDER, Y] < lm[..., RIGHT_SHOULDER, Y]
+    level_issue = (flags & ISSUE_BITS["shoulder_levelness"]) != 0
+    flags[level_issue & left_higher] |= LEFT_SHOULDER_HIGHER
+    return flags
+
+
+def describe_issues(flags, scores):
+    """
+    The ``issues`` list for one frame: its ISSUE_BITS bitmask expanded into
+    {"component", "severity", "message"} dicts. ``scores`` maps each
+    component to its score, which sets the severity.
+    """
+    issues = []
+    for component, bit in ISSUE_BITS.items():
+        if not flags & bit:
+            continue
+
+        message = ISSUE_MESSAGES[component]
+        if component == "shoulder_levelness":
+            higher = "left" if flags & LEFT_SHOULDER_HIGHER else "right"
+            message = message.format(side=higher)
+
+        issues.append({
+            "component": component,
+            "severity": get_score_label(float(scores[component])),
+            "message": message,
+        })
+    return issues
+
+
+def score_batch(landmarks, calibration=None):
+    """
+    Score a stack of frames at once.
+
+    ``landmarks`` is an (N, 33, 4) array. ``calibration`` is None, a
+    CalibrationBaseline shared by every frame, or calibration landmarks:
+    a single (33, 4) set or one set per frame as (N, 33, 4).
+
+    Returns a dict of length-N columns:
+        scorable            bool, False where landmarks are insufficient
+        overall, head_position, shoulder_levelness, shoulder_rounding,
+        spine_alignment     float64, rounded as in PostureScorer.score,
+                            NaN where not scorable
+        label               int8 index into LABELS, -1 where not scorable
+        issues              uint8 ISSUE_BITS bitmask
+
+    Values match PostureScorer.score frame for frame.
+    """
+    lm = np.asarray(landmarks)
+    if lm.ndim != 3 or lm.shape[1:] != (NUM_LANDMARKS, 4):
+        raise ValueError(f"Expected an (N, {NUM_LANDMARKS}, 4) array, got {lm.shape}")
+
+    baseline = calibration
+    if calibration is not None and not isinstance(calibration, CalibrationBaseline):
+        baseline = CalibrationBaseline.from_landmarks(calibration)
+
+    scores = component_scores(posture_geometry(lm), baseline)
+    scorable = landmarks_scorable(lm)
+
+    columns = ["overall", *WEIGHTS]
+    rounded = round_scores(np.stack([
+        np.broadcast_to(scores[column], scorable.shape) for column in columns
+    ]))
+    rounded[:, ~scorable] = np.nan
+
+    labels = label_codes(rounded[0])
+    labels[~scorable] = -1
+    issues = issue_flags(lm, scores)
+    issues[~scorable] = 0
+
+    result = {"scorable": scorable}
+    result.update(zip(columns, rounded))
+    result["label"] = labels
+    result["issues"] = issues
+    return result
+
+
+def _required_rows(landmarks):
+    """The REQUIRED_LANDMARKS of one frame as [x, y, z, visibility] float lists."""
+    if isinstance(landmarks, np.ndarray):
+        return landmarks[REQUIRED_LANDMARKS].tolist()
+    return [
+        [lm["x"], lm["y"], lm["z"], lm["visibility"]]
+        for lm in (landmarks[index] for index in REQUIRED_LANDMARKS)
+    ]
+
+
+def _frame_geometry(rows):
+    """posture_geometry for a single frame's ``_required_rows``, in plain floats."""
+    left_ear, right_ear, left_shoulder, right_shoulder, left_hip, right_hip = rows
+
+    ear_mid_x = (left_ear[X] + right_ear[X]) / 2
+    ear_mid_y = (left_ear[Y] + right_ear[Y]) / 2
+    shoulder_mid_x = (left_shoulder[X] + right_shoulder[X]) / 2
+    shoulder_mid_y = (left_shoulder[Y] + right_shoulder[Y]) / 2
+    hip_mid_x = (left_hip[X] + right_hip[X]) / 2
+    hip_mid_y = (left_hip[Y] + right_hip[Y]) / 2
+
+    shoulder_dx = left_shoulder[X] - right_shoulder[X]
+    shoulder_dy = left_shoulder[Y] - right_shoulder[Y]
+    hip_dx = left_hip[X] - right_hip[X]
+    hip_dy = left_hip[Y] - right_hip[Y]
+
+    return {
+        "head_offset_x": abs(ear_mid_x - shoulder_mid_x),
+        "head_offset_y": ear_mid_y - shoulder_mid_y,
+        "shoulder_dy": shoulder_dy,
+        "shoulder_width": math.sqrt(shoulder_dx * shoulder_dx + shoulder_dy * shoulder_dy),
+        "hip_width": math.sqrt(hip_dx * hip_dx + hip_dy * hip_dy),
+        "torso_angle": abs(math.degrees(math.atan2(
+            shoulder_mid_x - hip_mid_x,
+            -(shoulder_mid_y - hip_mid_y),
+        ))),
+    }
+
+
+def _frame_scores(g, baseline=None):
+    """component_scores for ``_frame_geometry`` output, in plain floats."""
+    if baseline is not None:
+        y_deviation = abs(g["head_offset_y"] - baseline.head_offset_y)
+        x_deviation = abs(g["head_offset_x"] - baseline.head_offset_x)
+        deviation = math.sqrt(y_deviation * y_deviation + x_deviation * x_deviation)
+    else:
+        deviation = g["head_offset_x"] + max(0.0, 0.15 - abs(g["head_offset_y"]))
+    head = max(0.0, 100 - (deviation / 0.15) * 100)
+
+    y_diff = abs(g["shoulder_dy"])
+    deviation = abs(y_diff - baseline.shoulder_diff) if baseline is not None else y_diff
+    level = max(0.0, 100 - (deviation / 0.05) * 100)
+
+    measurable = g["hip_width"] >= 0.01
+    if measurable:
+        ideal_ratio = baseline.shoulder_hip_ratio if baseline is not None else 1.2
+        deviation = max(0.0, ideal_ratio - g["shoulder_width"] / g["hip_width"])
+        rounding = max(0.0, 100 - (deviation / 0.3) * 100)
+    else:
+        rounding = 50.0
+
+    if baseline is not None:
+        deviation = abs(g["torso_angle"] - baseline.torso_angle)
+    else:
+        deviation = g["torso_angle"]
+    spine = max(0.0, 100 - (deviation / 15) * 100)
+
+    overall = (
+        head * WEIGHTS["head_position"]
+        + level * WEIGHTS["shoulder_levelness"]
+        + rounding * WEIGHTS["shoulder_rounding"]
+        + spine * WEIGHTS["spine_alignment"]
+    )
+
+    return {
+        "overall": max(0.0, min(100.0, overall)),
+        "head_position": head,
+        "shoulder_levelness": level,
+        "shoulder_rounding": rounding,
+        "spine_alignment": spine,
+        "rounding_measurable": measurable,
+    }
+
+
 class PostureScorer:
     """
     Computes a posture score (0-100) from MediaPipe landmarks.
 
     Optionally uses calibration landmarks as the "ideal" baseline.
     Without calibration, uses geometric heuristics for ideal posture.
+
+    Landmarks may be a (33, 4) landmark array or the list of dicts returned
+    by ``extract_landmarks``; dicts are converted and scored the same way.
+
+    Calibration landmarks are compiled into a CalibrationBaseline once, at
+    construction; a precompiled ``baseline`` can be passed instead.
+
+    ``score`` runs once per live frame on the event loop, so it does its
+    arithmetic in plain floats: NumPy's per-call overhead on a single frame
+    costs more than the math. ``score_batch`` is the NumPy path for stacks.
     """
 
-    def __init__(self, calibration_landmarks=None):
+    def __init__(self, calibration_landmarks=None, baseline=None):
         self.calibration = calibration_landmarks
+        if baseline is None and calibration_landmarks is not None and len(calibration_landmarks) > 0:
+            baseline = CalibrationBaseline.from_landmarks(calibration_landmarks)
+        self.baseline = baseline
 
     def score(self, landmarks):
         """
@@ -63,213 +468,36 @@ class PostureScorer:
 
         Returns dict with:
             overall_score, head_position_score, shoulder_levelness_score,
-            shoulder_rounding_score, spine_alignment_score, issues[], label
+            shoulder_rounding_score, spine_alignment_score, issues[],
+            issue_flags (ISSUE_BITS bitmask of issues), label
         Or None if landmarks are insufficient.
         """
-        if not landmarks_visible(landmarks, REQUIRED_LANDMARKS):
+        rows = _required_rows(landmarks)
+        if any(visibility < 0.5 for _, _, _, visibility in rows):
             return None
 
-        head = self._score_head_position(landmarks)
-        level = self._score_shoulder_levelness(landmarks)
-        rounding = self._score_shoulder_rounding(landmarks)
-        spine = self._score_spine_alignment(landmarks)
-
-        overall = (
-            head["score"] * WEIGHTS["head_position"]
-            + level["score"] * WEIGHTS["shoulder_levelness"]
-            + rounding["score"] * WEIGHTS["shoulder_rounding"]
-            + spine["score"] * WEIGHTS["spine_alignment"]
-        )
-        overall = round(max(0, min(100, overall)), 1)
-
-        issues = head["issues"] + level["issues"] + rounding["issues"] + spine["issues"]
+        scores = _frame_scores(_frame_geometry(rows), self.baseline)
+        flags = 0
+        for component, bit in ISSUE_BITS.items():
+            if scores[component] < ISSUE_THRESHOLD:
+                if component != "shoulder_rounding" or scores["rounding_measurable"]:
+                    flags |= bit
+        left_shoulder, right_shoulder = rows[2], rows[3]
+        if flags & ISSUE_BITS["shoulder_levelness"] and left_shoulder[Y] < right_shoulder[Y]:
+            flags |= LEFT_SHOULDER_HIGHER
+        overall = round(scores["overall"], 1)
 
         return {
             "overall_score": overall,
-            "head_position_score": round(head["score"], 1),
-            "shoulder_levelness_score": round(level["score"], 1),
-            "shoulder_rounding_score": round(rounding["score"], 1),
-            "spine_alignment_score": round(spine["score"], 1),
-            "issues": issues,
+            "head_position_score": round(scores["head_position"], 1),
+            "shoulder_levelness_score": round(scores["shoulder_levelness"], 1),
+            "shoulder_rounding_score": round(scores["shoulder_rounding"], 1),
+            "spine_alignment_score": round(scores["spine_alignment"], 1),
+            "issues": describe_issues(flags, scores),
+            "issue_flags": flags,
             "label": get_score_label(overall),
         }
 
-    def _score_head_position(self, landmarks):
-        """
-        Forward head position: measures how far the ear midpoint is
-        forward (in x) relative to the shoulder midpoint.
-
-        In a frontal view, forward head posture manifests as the ears
-        appearing higher and the head tilting forward, changing the
-        ear-to-shoulder vertical ratio.
-        """
-        ear_mid = midpoint(
-            get_landmark(landmarks, LEFT_EAR),
-            get_landmark(landmarks, RIGHT_EAR),
-        )
-        shoulder_mid = midpoint(
-            get_landmark(landmarks, LEFT_SHOULDER),
-            get_landmark(landmarks, RIGHT_SHOULDER),
-        )
-
-        if self.calibration:
-            cal_ear_mid = midpoint(
-                get_landmark(self.calibration, LEFT_EAR),
-                get_landmark(self.calibration, RIGHT_EAR),
-            )
-            cal_shoulder_mid = midpoint(
-                get_landmark(self.calibration, LEFT_SHOULDER),
-                get_landmark(self.calibration, RIGHT_SHOULDER),
-            )
-            ideal_offset_y = cal_ear_mid["y"] - cal_shoulder_mid["y"]
-            current_offset_y = ear_mid["y"] - shoulder_mid["y"]
-            # Also check horizontal drift
-            ideal_offset_x = abs(cal_ear_mid["x"] - cal_shoulder_mid["x"])
-            current_offset_x = abs(ear_mid["x"] - shoulder_mid["x"])
-
-            # Deviation from calibrated ideal
-            y_deviation = abs(current_offset_y - ideal_offset_y)
-            x_deviation = abs(current_offset_x - ideal_offset_x)
-            deviation = math.sqrt(y_deviation**2 + x_deviation**2)
-        else:
-            # Without calibration, measure ear-shoulder vertical distance ratio
-            # and horizontal alignment
-            vertical_dist = abs(ear_mid["y"] - shoulder_mid["y"])
-            horizontal_drift = abs(ear_mid["x"] - shoulder_mid["x"])
-            # Ideal: ears directly above shoulders, good vertical separation
-            deviation = horizontal_drift + max(0, 0.15 - vertical_dist)
-
-        # Convert deviation to score (0-100). Max deviation ~0.15 normalized coords.
-        score = max(0, 100 - (deviation / 0.15) * 100)
-
-        issues = []
-        if score < 70:
-            issues.append({
-                "component": "head_position",
-                "severity": get_score_label(score),
-                "message": "Head is forward of ideal position — try tucking your chin back.",
-            })
-
-        return {"score": score, "issues": issues}
-
-    def _score_shoulder_levelness(self, landmarks):
-        """
-        Shoulder levelness: Y-coordinate difference between left and right shoulders.
-        Perfectly level shoulders have the same Y value.
-        """
-        left_sh = get_landmark(landmarks, LEFT_SHOULDER)
-        right_sh = get_landmark(landmarks, RIGHT_SHOULDER)
-
-        y_diff = abs(left_sh["y"] - right_sh["y"])
-
-        if self.calibration:
-            cal_left = get_landmark(self.calibration, LEFT_SHOULDER)
-            cal_right = get_landmark(self.calibration, RIGHT_SHOULDER)
-            ideal_diff = abs(cal_left["y"] - cal_right["y"])
-            deviation = abs(y_diff - ideal_diff)
-        else:
-            deviation = y_diff
-
-        # Max tolerable deviation ~0.05 in normalized coords
-        score = max(0, 100 - (deviation / 0.05) * 100)
-
-        issues = []
-        if score < 70:
-            higher = "left" if left_sh["y"] < right_sh["y"] else "right"
-            issues.append({
-                "component": "shoulder_levelness",
-                "severity": get_score_label(score),
-                "message": f"Your {higher} shoulder is higher — try to relax and level your shoulders.",
-            })
-
-        return {"score": score, "issues": issues}
-
-    def _score_shoulder_rounding(self, landmarks):
-        """
-        Shoulder rounding: ratio of shoulder width to hip width.
-        Rounded shoulders reduce the apparent shoulder width relative to hips.
-        """
-        left_sh = get_landmark(landmarks, LEFT_SHOULDER)
-        right_sh = get_landmark(landmarks, RIGHT_SHOULDER)
-        left_hip = get_landmark(landmarks, LEFT_HIP)
-        right_hip = get_landmark(landmarks, RIGHT_HIP)
-
-        shoulder_width = distance_2d(left_sh, right_sh)
-        hip_width = distance_2d(left_hip, right_hip)
-
-        if hip_width < 0.01:
-            return {"score": 50, "issues": []}
-
-        ratio = shoulder_width / hip_width
-
-        if self.calibration:
-            cal_sw = distance_2d(
-                get_landmark(self.calibration, LEFT_SHOULDER),
-                get_landmark(self.calibration, RIGHT_SHOULDER),
-            )
-            cal_hw = distance_2d(
-                get_landmark(self.calibration, LEFT_HIP),
-                get_landmark(self.calibration, RIGHT_HIP),
-            )
-            ideal_ratio = cal_sw / cal_hw if cal_hw > 0.01 else 1.0
-            deviation = max(0, ideal_ratio - ratio)  # rounding decreases ratio
-        else:
-            # Good posture: shoulders wider than hips (ratio ~1.1-1.3)
-            ideal_ratio = 1.2
-            deviation = max(0, ideal_ratio - ratio)
-
-        # Max deviation ~0.3
-        score = max(0, 100 - (deviation / 0.3) * 100)
-
-        issues = []
-        if score < 70:
-            issues.append({
-                "component": "shoulder_rounding",
-                "severity": get_score_label(score),
-                "message": "Shoulders appear rounded — pull your shoulder blades back and together.",
-            })
-
-        return {"score": score, "issues": issues}
-
-    def _score_spine_alignment(self, landmarks):
-        """
-        Spine alignment: angle of the torso midline from vertical.
-        Measures the line from hip midpoint to shoulder midpoint.
-        """
-        shoulder_mid = midpoint(
-            get_landmark(landmarks, LEFT_SHOULDER),
-            get_landmark(landmarks, RIGHT_SHOULDER),
-        )
-        hip_mid = midpoint(
-            get_landmark(landmarks, LEFT_HIP),
-            get_landmark(landmarks, RIGHT_HIP),
-        )
-
-        angle = abs(angle_from_vertical(shoulder_mid, hip_mid))
-
-        if self.calibration:
-            cal_shoulder_mid = midpoint(
-                get_landmark(self.calibration, LEFT_SHOULDER),
-                get_landmark(self.calibration, RIGHT_SHOULDER),
-            )
-            cal_hip_mid = midpoint(
-                get_landmark(self.calibration, LEFT_HIP),
-                get_landmark(self.calibration, RIGHT_HIP),
-            )
-            ideal_angle = abs(angle_from_vertical(cal_shoulder_mid, cal_hip_mid))
-            deviation = abs(angle - ideal_angle)
-        else:
-            deviation = angle  # ideal is 0 degrees (vertical)
-
-        # Max tolerable deviation ~15 degrees
-        score = max(0, 100 - (deviation / 15) * 100)
-
-        issues = []
-        if score < 70:
-            issues.append({
-                "component": "spine_alignment",
-                "severity": get_score_label(score),
-                "message": "Your torso is leaning to one side — sit or stand upright.",
-            })
-
-        return {"score": score, "issues": issues}
+    def score_batch(self, landmarks):
+        """Score an (N, 33, 4) stack against this scorer's calibration; see score_batch."""
+        return score_batch(landmarks, self.baseline)
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from posture_project.row_serializers import RowSerializer
+
 from .models import PostureScore, PostureSession
 
 
@@ -19,8 +21,6 @@ class PostureScoreSerializer(serializers.ModelSerializer):
 
 
 class PostureSessionListSerializer(serializers.ModelSerializer):
-    score_count = serializers.IntegerField(source="scores.count", read_only=True)
-
     class Meta:
         model = PostureSession
         fields = [
@@ -33,8 +33,22 @@ class PostureSessionListSerializer(serializers.ModelSerializer):
         ]
 
 
+class PostureScoreRowSerializer(RowSerializer):
+    """Fast path for PostureScoreSerializer; same JSON."""
+
+    fields = PostureScoreSerializer.Meta.fields
+    datetime_fields = ("timestamp",)
+
+
+class PostureSessionListRowSerializer(RowSerializer):
+    """Fast path for PostureSessionListSerializer; same JSON."""
+
+    fields = PostureSessionListSerializer.Meta.fields
+    datetime_fields = ("started_at", "ended_at")
+
+
 class PostureSessionDetailSerializer(serializers.ModelSerializer):
-    scores = PostureScoreSerializer(many=True, read_only=True)
+    """Session summary; the scores themselves come from SessionScoresView."""
 
     class Meta:
         model = PostureSession
@@ -44,6 +58,7 @@ class PostureSessionDetailSerializer(serializers.ModelSerializer):
             "ended_at",
             "average_score",
             "calibration_data",
+            "stats",
             "is_active",
-            "scores",
+            "score_count",
         ]
@@ -0,0 +1,120 @@
+"""
+Compact per-session score series.
+
+With POSTURE_SCORE_STORAGE = "series", the scores a session would have
+written as PostureScore rows are instead kept as fixed-width records in a
+single PostureSeries blob:
+
+    t_ms        uint32  milliseconds since the session started
+    overall,
+    head_position,
+    shoulder_levelness,
+    shoulder_rounding,
+    spine_alignment     uint16  score in tenths (scores are rounded to 0.1)
+    issues      uint8   ISSUE_BITS bitmask
+
+15 bytes per sample instead of a row with its own JSON ``issues``. The
+min/mean/max rollups over POSTURE_SERIES_ROLLUPS second buckets are
+computed once when the session ends.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+from .scoring import WEIGHTS, describe_issues
+
+COMPONENTS = ("overall", *WEIGHTS)
+
+SERIES_DTYPE = np.dtype(
+    [("t_ms", "<u4")]
+    + [(component, "<u2") for component in COMPONENTS]
+    + [("issues", "u1")]
+)
+
+
+class SeriesRecorder:
+    """Accumulates a session's samples in memory until the session ends."""
+
+    def __init__(self, started_at):
+        self.started_at = started_at
+        self._data = bytearray()
+
+    def __len__(self):
+        return len(self._data) // SERIES_DTYPE.itemsize
+
+    def append(self, timestamp, result):
+        """Add one PostureScorer.score result recorded at ``timestamp``."""
+        t_ms = (timestamp - self.started_at).total_seconds() * 1000
+        sample = np.array(
+            [(
+                max(0, round(t_ms)),
+                round(result["overall_score"] * 10),
+                round(result["head_position_score"] * 10),
+                round(result["shoulder_levelness_score"] * 10),
+                round(result["shoulder_rounding_score"] * 10),
+                round(result["spine_alignment_score"] * 10),
+                result["issue_flags"],
+            )],
+            dtype=SERIES_DTYPE,
+        )
+        self._data += sample.tobytes()
+
+    def tobytes(self):
+        return bytes(self._data)
+
+
+def decode_series(data):
+    """Unpack a series blob into a structured array (no copy)."""
+    return np.frombuffer(data, dtype=SERIES_DTYPE)
+
+
+def series_records(samples, started_at):
+    """
+    Samples as dicts with PostureScore's fields, so they serialize the same
+    way as score rows. Samples have no row id, so ``id`` is None, and
+    ``issues`` is rebuilt from the stored bitmask.
+    """
+    records = []
+    for t_ms, *scores, flags in samples.tolist():
+        record = {"id": None, "timestamp": started_at + timedelta(milliseconds=t_ms)}
+        for component, value in zip(COMPONENTS, scores):
+            record[f"{component}_score"] = value / 10
+        record["issues"] = describe_issues(flags, {
+            component: value / 10 for component, value in zip(COMPONENTS, scores)
+        })
+        records.append(record)
+    return records
+
+
+def rollup(samples, bucket_seconds):
+    """
+    Downsample to fixed ``bucket_seconds`` buckets.
+
+    Returns columns ``t`` (bucket start, seconds), ``count`` and, per
+    component, {"min", "mean", "max"}. Empty buckets are omitted.
+    """
+    if len(samples) == 0:
+        return {"t": [], "count": []}
+
+    bucket = samples["t_ms"] // (bucket_seconds * 1000)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    counts = np.diff(np.r_[starts, len(samples)])
+
+    result = {
+        "t": (bucket[starts] * bucket_seconds).tolist(),
+        "count": counts.tolist(),
+    }
+    for component in COMPONENTS:
+        values = samples[component] / 10
+        result[component] = {
+            "min": np.minimum.reduceat(values, starts).tolist(),
+            "mean": np.round(np.add.reduceat(values, starts) / counts, 1).tolist(),
+            "max": np.maximum.reduceat(values, starts).tolist(),
+        }
+    return result
+
+
+def build_rollups(samples, bucket_sizes):
+    """Rollups for each bucket size, keyed like "10s"."""
+    return {f"{seconds}s": rollup(samples, seconds) for seconds in bucket_sizes}
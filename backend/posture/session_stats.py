@@ -0,0 +1,106 @@
+"""
+Online per-session statistics.
+
+The consumer feeds every scored frame into a SessionStats; each update is
+O(1), and the result is saved to ``PostureSession.stats`` when the session
+ends, so summaries and recommendations never have to re-read score rows.
+"""
+
+import math
+
+from .scoring import LABELS, WEIGHTS
+
+# Gaps longer than this (no pose, paused camera) don't count towards the
+# time spent in a label
+MAX_LABEL_GAP_SECONDS = 1.0
+
+
+class RunningStat:
+    """Count, sum, min, max and Welford mean/variance of a stream of values."""
+
+    __slots__ = ("count", "total", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    def as_dict(self):
+        if not self.count:
+            return {"mean": None, "std": None, "min": None, "max": None}
+        return {
+            # total / count rather than the running mean, so the average
+            # is exactly what summing the scores would give
+            "mean": round(self.total / self.count, 1),
+            "std": round(math.sqrt(self.variance), 2),
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class SessionStats:
+    """Aggregates PostureScorer.score results for one session."""
+
+    def __init__(self):
+        self.overall = RunningStat()
+        self.components = {component: RunningStat() for component in WEIGHTS}
+        self.label_seconds = dict.fromkeys(LABELS, 0.0)
+        self.issue_counts = dict.fromkeys(WEIGHTS, 0)
+        self._last_label = None
+        self._last_time = None
+
+    @property
+    def count(self):
+        return self.overall.count
+
+    def add(self, result, now):
+        """Add one scored frame; ``now`` is a time.monotonic() timestamp."""
+        self.overall.add(result["overall_score"])
+        for component, stat in self.components.items():
+            stat.add(result[f"{component}_score"])
+        for issue in result["issues"]:
+            self.issue_counts[issue["component"]] += 1
+
+        # The previous label held until this frame arrived
+        if self._last_label is not None:
+            gap = now - self._last_time
+            if gap <= MAX_LABEL_GAP_SECONDS:
+                self.label_seconds[self._last_label] += gap
+        self._last_label = result["label"]
+        self._last_time = now
+
+    def average_score(self):
+        if not self.count:
+            return None
+        return round(self.overall.total / self.count, 1)
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "overall": self.overall.as_dict(),
+            "components": {
+                component: stat.as_dict() for component, stat in self.components.items()
+            },
+            "label_seconds": {
+                label: round(seconds, 2) for label, seconds in self.label_seconds.items()
+            },
+            "issue_counts": dict(self.issue_counts),
+        }
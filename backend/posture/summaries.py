@@ -0,0 +1,128 @@
+"""
+Per-user aggregates kept up to date as sessions finish:
+
+- UserPostureSummary: per-component averages over the most recent finished
+  sessions, so the exercise recommender reads one row instead of
+  aggregating score rows on every request.
+- DailyPostureRollup: per-day session count, score sum and duration, so the
+  stats endpoint reads at most one row per day in its window.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import DailyPostureRollup, PostureScore, PostureSession, UserPostureSummary
+from .scoring import WEIGHTS
+
+# How many of the user's latest finished sessions the averages cover
+RECENT_SESSIONS = 5
+
+
+def session_entry(session):
+    """Frame count and per-component score sums for one finished session."""
+    stats = session.stats
+    if stats:
+        sums = {}
+        for component, stat in stats["components"].items():
+            if stat["mean"] is not None:
+                sums[component] = stat["mean"] * stats["count"]
+        count = stats["count"]
+    else:
+        # Sessions recorded before running statistics were kept
+        rows = PostureScore.objects.filter(session=session).aggregate(
+            count=Count("id"),
+            **{component: Sum(f"{component}_score") for component in WEIGHTS},
+        )
+        count = rows.pop("count")
+        sums = {component: total for component, total in rows.items() if total is not None}
+    return {
+        "id": session.id,
+        "started_at": session.started_at.isoformat(),
+        "count": count,
+        "sums": sums,
+    }
+
+
+def component_averages(entries):
+    """Frame-weighted average of each component across session entries."""
+    averages = {}
+    for component in WEIGHTS:
+        count = sum(e["count"] for e in entries if component in e["sums"])
+        if count:
+            total = sum(e["sums"][component] for e in entries if component in e["sums"])
+            averages[component] = total / count
+    return averages
+
+
+def record_session(session):
+    """Fold a just-finalized session into its user's summary."""
+    entry = session_entry(session)
+    with transaction.atomic():
+        summary, _ = UserPostureSummary.objects.select_for_update().get_or_create(
+            user_id=session.user_id,
+        )
+        entries = [e for e in summary.recent_sessions if e["id"] != session.id]
+        entries.append(entry)
+        entries.sort(key=lambda e: e["started_at"], reverse=True)
+        summary.recent_sessions = entries[:RECENT_SESSIONS]
+        summary.component_averages = component_averages(summary.recent_sessions)
+        summary.save()
+    return summary
+
+
+def rebuild_summary(user):
+    """Recompute a user's summary from their sessions (backfill / repair)."""
+    sessions = PostureSession.objects.filter(
+        user=user, is_active=False,
+    ).order_by("-started_at")[:RECENT_SESSIONS]
+    entries = [session_entry(session) for session in sessions]
+    summary, _ = UserPostureSummary.objects.update_or_create(
+        user=user,
+        defaults={
+            "recent_sessions": entries,
+            "component_averages": component_averages(entries),
+        },
+    )
+    return summary
+
+
+def add_to_rollup(rollup, session):
+    """Add one finished session's totals to a DailyPostureRollup (unsaved)."""
+    rollup.session_count += 1
+    if session.average_score is not None:
+        rollup.scored_session_count += 1
+        rollup.score_sum += session.average_score
+    if session.ended_at is not None:
+        rollup.duration_seconds += max(
+            (session.ended_at - session.started_at).total_seconds(), 0,
+        )
+
+
+def record_daily(session):
+    """Fold a just-finalized session into its user's rollup for that day."""
+    with transaction.atomic():
+        rollup, _ = DailyPostureRollup.objects.select_for_update().get_or_create(
+            user_id=session.user_id,
+            date=timezone.localdate(session.started_at),
+        )
+        add_to_rollup(rollup, session)
+        rollup.save()
+    return rollup
+
+
+def rebuild_daily(user):
+    """Recompute a user's daily rollups from their sessions (backfill / repair)."""
+    rollups = {}
+    sessions = PostureSession.objects.filter(user=user, is_active=False).only(
+        "started_at", "ended_at", "average_score",
+    )
+    for session in sessions.iterator():
+        date = timezone.localdate(session.started_at)
+        if date not in rollups:
+            rollups[date] = DailyPostureRollup(user=user, date=date)
+        add_to_rollup(rollups[date], session)
+    with transaction.atomic():
+        DailyPostureRollup.objects.filter(user=user).delete()
+        DailyPostureRollup.objects.bulk_create(rollups.values())
+    return list(rollups.values())
@@ -0,0 +1,282 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import OperationalError
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from . import detector_pool
+from .downsampling import bucket_score_rows
+from .frame_mailbox import FrameMailbox, PendingFrame
+from .inference import InferenceBusy, ThreadBackend
+from .models import PostureScore, PostureSeries, PostureSession
+from .rate_control import LEVELS, NodeLoad, RateController
+from .score_buffer import ScoreBuffer
+from .management.commands.bench_scoring import compare, synthetic_frames
+from .scoring import ISSUE_BITS, LEFT_SHOULDER_HIGHER, CalibrationBaseline, PostureScorer
+from .serializers import PostureScoreSerializer
+from .series import SeriesRecorder
+
+
+class RateControlTests(SimpleTestCase):
+    def setUp(self):
+        self.node = NodeLoad()
+        self.now = self.node._updated
+        self.rate = RateController(0.25, interval=2.0, node=self.node)
+        self.rate.window_started = self.now
+
+    def run_window(self, latency, frames=20, busy=False):
+        """One control interval of ``frames`` frames, each keeping the node busy for ``latency``."""
+        step = self.rate.interval / frames
+        for _ in range(frames):
+            self.node.begin(capacity=1, now=self.now)
+            if busy:
+                self.node.mark_busy(now=self.now)
+            self.node.end(now=self.now + min(latency, step))
+            self.rate.record_frame(latency)
+            self.now += step
+        self.now += 0.01
+        return self.rate.update(self.now)
+
+    def test_steps_down_under_load_and_recovers_when_idle(self):
+        # 4 s of overload: slow frames on a saturated node
+        for _ in range(2):
+            level, reason = self.run_window(latency=0.4, busy=True)
+            self.assertEqual(reason, "node_busy")
+        self.assertEqual(self.rate.level, LEVELS[2])
+
+        # A fast detector on a node that is otherwise idle
+        changes = [self.run_window(latency=0.01) for _ in range(6)]
+        self.assertEqual([reason for _, reason in filter(None, changes)], ["recovered"] * 2)
+        self.assertEqual(self.rate.level, LEVELS[0])
+
+    def test_only_expired_or_refused_frames_count_as_dropped(self):
+        for _ in range(5):
+            self.rate.record_frame(0.01)
+        self.rate.record_dropped()
+        self.now += 2.1
+        level, reason = self.rate.update(self.now)
+        self.assertEqual(reason, "dropped_frames")
+        self.assertEqual(level, LEVELS[1])
+
+    def test_utilization_decays_when_idle(self):
+        self.node.begin(capacity=2, now=self.now)
+        self.node.begin(capacity=2, now=self.now)
+        self.assertGreater(self.node.utilization(self.now + 10), 0.99)
+        self.node.end(now=self.now + 10)
+        self.node.end(now=self.now + 10)
+        self.assertLess(self.node.utilization(self.now + 20), 0.01)
+
+
+class FrameMailboxTests(SimpleTestCase):
+    async def test_newest_frame_wins(self):
+        mailbox = FrameMailbox()
+        for seq in range(3):
+            mailbox.put(PendingFrame(b"", seq))
+        frame = await mailbox.get()
+        self.assertEqual(frame.seq, 2)
+        self.assertEqual(mailbox.take_dropped(), 2)
+
+        mailbox.put(PendingFrame(b"", 3))
+        mailbox.close()
+        self.assertIsNone(await mailbox.get())
+        self.assertEqual(mailbox.total_dropped, 3)
+
+
+class PostureScorerTests(SimpleTestCase):
+    def test_single_frame_scores_match_score_batch(self):
+        frames = synthetic_frames(500)
+        calibration = CalibrationBaseline.from_landmarks(synthetic_frames(1, seed=1)[0])
+        for baseline in (None, calibration):
+            scorer = PostureScorer(baseline=baseline)
+            single = [scorer.score(frame) for frame in frames]
+            self.assertEqual(compare(single, scorer.score_batch(frames)), 0)
+
+
+def make_score(session, **fields):
+    return PostureScore(
+        session=session,
+        overall_score=80.0,
+        head_position_score=80.0,
+        shoulder_levelness_score=80.0,
+        shoulder_rounding_score=80.0,
+        spine_alignment_score=80.0,
+        **fields,
+    )
+
+
+class ScoreBufferTests(TransactionTestCase):
+    result = {
+        "overall_score": 80.0,
+        "head_position_score": 80.0,
+        "shoulder_levelness_score": 80.0,
+        "shoulder_rounding_score": 80.0,
+        "spine_alignment_score": 80.0,
+        "issues": [],
+    }
+
+    def setUp(self):
+        user = User.objects.create_user("buffer", password="pw")
+        self.session = PostureSession.objects.create(user=user)
+        # Rows are only written by explicit flush() calls
+        self.buffer = ScoreBuffer(max_rows=10, flush_rows=100, flush_interval=60)
+        self.addCleanup(self.buffer.close)
+
+    def test_deleted_session_does_not_lose_other_sessions_scores(self):
+        deleted = PostureSession.objects.create(user=self.session.user)
+        self.buffer.add(self.session.pk, self.result)
+        self.buffer.add(deleted.pk, self.result)
+        self.buffer.add(self.session.pk, self.result)
+        deleted.delete()
+
+        with self.assertLogs("posture.score_buffer", "WARNING"):
+            self.assertTrue(self.buffer.flush())
+        self.assertEqual(self.session.scores.count(), 2)
+        self.assertEqual(len(self.buffer._rows), 0)
+
+    def test_rows_are_kept_for_retry_after_a_connection_error(self):
+        for _ in range(6):
+            self.buffer.add(self.session.pk, self.result)
+        with patch.object(
+            PostureScore.objects, "bulk_create", side_effect=OperationalError("gone away"),
+        ), self.assertLogs("posture.score_buffer", "WARNING"):
+            self.assertFalse(self.buffer.flush())
+
+        # Newer rows queue behind the requeued ones, within max_rows
+        for _ in range(6):
+            self.buffer.add(self.session.pk, self.result)
+        self.assertEqual(len(self.buffer._rows), 10)
+        self.assertTrue(self.buffer.flush())
+        self.assertEqual(self.session.scores.count(), 10)
+
+
+class FakeDetector:
+    def close(self):
+        pass
+
+
+@override_settings(
+    POSE_RUNNING_MODE="video",
+    POSE_DETECTOR_POOL_SIZE=4,
+    POSE_VIDEO_DETECTOR_POOL_SIZE=6,
+    POSE_DETECTOR_ACQUIRE_TIMEOUT=0,
+)
+class VideoSessionPoolTests(SimpleTestCase):
+    def setUp(self):
+        factories = {
+            mode: (f"test_{name}", FakeDetector, size_setting)
+            for mode, (name, _, size_setting) in detector_pool._FACTORIES.items()
+        }
+        self.enterContext(patch.dict(detector_pool._FACTORIES, factories))
+        self.enterContext(patch.dict(detector_pool._pools, clear=True))
+
+    async def test_video_sessions_are_capped_by_their_own_pool(self):
+        backend = ThreadBackend()
+        self.assertEqual(backend.capacity, 6)
+        sessions = [await backend.open_session() for _ in range(6)]
+        with self.assertRaises(InferenceBusy):
+            await backend.open_session()
+
+        await sessions[0].close()
+        sessions[0] = await backend.open_session()
+        for session in sessions:
+            await session.close()
+
+
+class SessionListQueryTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("history", password="pw")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def create_sessions(self, count, scores_per_session=5):
+        for _ in range(count):
+            session = PostureSession.objects.create(
+                user=self.user,
+                is_active=False,
+                ended_at=timezone.now(),
+                average_score=80.0,
+                score_count=scores_per_session,
+            )
+            PostureScore.objects.bulk_create(
+                make_score(session) for _ in range(scores_per_session)
+            )
+
+    def list_sessions(self):
+        # One COUNT for the paginator, one page of sessions
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("session-list"))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_query_count_does_not_grow_with_sessions(self):
+        self.create_sessions(1)
+        response = self.list_sessions()
+        self.assertEqual(response.data["results"][0]["score_count"], 5)
+
+        self.create_sessions(14)
+        response = self.list_sessions()
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(len(response.data["results"]), 15)
+
+
+class BucketScoreRowsTests(TestCase):
+    def test_score_at_session_start_lands_in_first_bucket(self):
+        user = User.objects.create_user("buckets", password="pw")
+        session = PostureSession.objects.create(user=user, is_active=False)
+        # julianday() puts this instant ~0.1 ms before its Python timestamp
+        started_at = datetime(2026, 10, 18, 12, 1, 7, 778094, tzinfo=dt_timezone.utc)
+        PostureScore.objects.bulk_create([
+            make_score(session, timestamp=started_at),
+            make_score(session, timestamp=started_at + timedelta(seconds=12.5)),
+        ])
+
+        buckets = bucket_score_rows(session.scores.all(), started_at, 10)
+        self.assertEqual(buckets["t"], [0, 10])
+        self.assertEqual(buckets["count"], [1, 1])
+
+
+class SessionScoresSchemaTests(APITestCase):
+    def test_series_and_row_sessions_return_the_same_fields(self):
+        user = User.objects.create_user("scores", password="pw")
+        self.client.force_authenticate(user)
+        result = {
+            "overall_score": 62.5,
+            "head_position_score": 55.0,
+            "shoulder_levelness_score": 48.0,
+            "shoulder_rounding_score": 80.0,
+            "spine_alignment_score": 70.0,
+        }
+
+        rows = PostureSession.objects.create(user=user, is_active=False)
+        PostureScore.objects.create(session=rows, **result)
+
+        series = PostureSession.objects.create(user=user, is_active=False)
+        recorder = SeriesRecorder(series.started_at)
+        recorder.append(
+            series.started_at + timedelta(seconds=1),
+            {**result, "issue_flags": ISSUE_BITS["shoulder_levelness"] | LEFT_SHOULDER_HIGHER},
+        )
+        PostureSeries.objects.create(session=series, sample_count=1, samples=recorder.tobytes())
+
+        for session in (rows, series):
+            response = self.client.get(reverse("session-scores", args=[session.pk]))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                list(response.data["results"][0]), PostureScoreSerializer.Meta.fields,
+            )
+
+        sample = response.data["results"][0]
+        self.assertIsNone(sample["id"])
+        self.assertEqual(sample["shoulder_levelness_score"], 48.0)
+        self.assertEqual(
+            [(issue["component"], issue["severity"]) for issue in sample["issues"]],
+            [("shoulder_levelness", "needs_work")],
+        )
+        self.assertIn("left shoulder", sample["issues"][0]["message"])
@@ -5,5 +5,6 @@ from . import views
 urlpatterns = [
     path("sessions/", views.SessionListView.as_view(), name="session-list"),
     path("sessions/<int:pk>/", views.SessionDetailView.as_view(), name="session-detail"),
+    path("sessions/<int:pk>/scores/", views.SessionScoresView.as_view(), name="session-scores"),
     path("stats/", views.StatsView.as_view(), name="posture-stats"),
 ]
@@ -1,16 +1,31 @@
-from django.db.models import Avg
-from django.db.models.functions import TruncDate
+from datetime import timedelta
+
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
-from .models import PostureSession
-from .serializers import PostureSessionDetailSerializer, PostureSessionListSerializer
+from posture_project.row_serializers import RowListMixin
+
+from .downsampling import bucket_score_rows, bucket_series, bucket_width, parse_resolution
+from .models import DailyPostureRollup, PostureScore, PostureSeries, PostureSession
+from .serializers import (
+    PostureScoreRowSerializer,
+    PostureScoreSerializer,
+    PostureSessionDetailSerializer,
+    PostureSessionListRowSerializer,
+    PostureSessionListSerializer,
+)
+from .series import decode_series, series_records
 
 
-class SessionListView(generics.ListAPIView):
+class SessionListView(RowListMixin, generics.ListAPIView):
     serializer_class = PostureSessionListSerializer
+    row_serializer_class = PostureSessionListRowSerializer
 
     def get_queryset(self):
         return PostureSession.objects.filter(
@@ -26,30 +41,129 @@ class SessionDetailView(generics.RetrieveAPIView):
         return PostureSession.objects.filter(user=self.request.user)
 
 
-class StatsView(APIView):
-    def get(self, request):
-        days = int(request.query_params.get("days", 7))
-        since = timezone.now() - timezone.timedelta(days=days)
+class ScoreCursorPagination(CursorPagination):
+    ordering = ("timestamp", "id")
+    page_size = 500
+    page_size_query_param = "page_size"
+    max_page_size = 2000
 
-        sessions = PostureSession.objects.filter(
-            user=request.user,
-            is_active=False,
-            started_at__gte=since,
-        )
 
-        stats = sessions.aggregate(avg_score=Avg("average_score"))
-        daily_scores = (
-            sessions.annotate(day=TruncDate("started_at"))
-            .values("day")
-            .annotate(avg=Avg("average_score"))
-            .order_by("day")
+class SessionScoresView(RowListMixin, generics.ListAPIView):
+    """
+    A session's scores.
+
+    Without ``resolution``, returns the raw scores, cursor-paginated. With
+    ``resolution`` (e.g. 10s, 1m, 1h or auto) returns min/mean/max per
+    component over fixed-width time buckets, computed server-side; the
+    bucket width is widened if needed to keep at most MAX_BUCKETS points.
+
+    Raw scores have the same fields whichever POSTURE_SCORE_STORAGE the
+    session was recorded with; series samples have no row, so their ``id``
+    is null.
+    """
+
+    serializer_class = PostureScoreSerializer
+    row_serializer_class = PostureScoreRowSerializer
+    pagination_class = ScoreCursorPagination
+
+    def get_queryset(self):
+        return PostureScore.objects.filter(session=self.session)
+
+    def list(self, request, *args, **kwargs):
+        self.session = get_object_or_404(
+            PostureSession.objects.filter(user=request.user).select_related("series"),
+            pk=kwargs["pk"],
         )
+        try:
+            series = self.session.series
+        except PostureSeries.DoesNotExist:
+            series = None
+
+        resolution = request.query_params.get("resolution")
+        if resolution is None:
+            if series is not None:
+                return self._series_page(series)
+            return super().list(request, *args, **kwargs)
+
+        try:
+            requested = parse_resolution(resolution)
+        except ValueError as e:
+            raise ValidationError({"resolution": str(e)})
+        ended_at = self.session.ended_at or timezone.now()
+        width = bucket_width(requested, (ended_at - self.session.started_at).total_seconds())
+
+        if series is not None:
+            buckets = bucket_series(series, width)
+        else:
+            buckets = bucket_score_rows(self.get_queryset(), self.session.started_at, width)
+        return Response({
+            "session_id": self.session.id,
+            "resolution": f"{width}s",
+            **buckets,
+        })
+
+    def _series_page(self, series):
+        """Page through a series-stored session; the cursor is a sample offset."""
+        page_size = self.paginator.get_page_size(self.request)
+        try:
+            start = max(0, int(self.request.query_params.get("cursor", 0)))
+        except ValueError:
+            raise ValidationError({"cursor": "Invalid cursor."})
+
+        samples = decode_series(series.samples)
+        page = samples[start:start + page_size]
+        url = self.request.build_absolute_uri()
+        next_url = None
+        if start + page_size < len(samples):
+            next_url = replace_query_param(url, "cursor", start + page_size)
+        previous_url = None
+        if start > 0:
+            previous_url = replace_query_param(url, "cursor", max(0, start - page_size))
+
+        records = series_records(page, self.session.started_at)
+        return Response({
+            "next": next_url,
+            "previous": previous_url,
+            "results": PostureScoreRowSerializer.serialize(records),
+        })
+
+
+class StatsView(APIView):
+    """
+    Dashboard stats over the last ``days`` calendar days (today included),
+    read from the per-day rollups in one query.
+    """
+
+    MAX_DAYS = 365
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get("days", 7))
+        except ValueError:
+            raise ValidationError({"days": "Must be an integer."})
+        if not 1 <= days <= self.MAX_DAYS:
+            raise ValidationError({"days": f"Must be between 1 and {self.MAX_DAYS}."})
+        since = timezone.localdate() - timedelta(days=days)
+
+        rollups = list(DailyPostureRollup.objects.filter(user=request.user, date__gt=since))
 
+        scored = sum(rollup.scored_session_count for rollup in rollups)
         return Response(
             {
                 "period_days": days,
-                "total_sessions": sessions.count(),
-                "average_score": stats["avg_score"],
-                "daily_scores": list(daily_scores),
+                "total_sessions": sum(rollup.session_count for rollup in rollups),
+                "average_score": (
+                    sum(rollup.score_sum for rollup in rollups) / scored if scored else None
+                ),
+                "total_minutes": round(sum(rollup.duration_seconds for rollup in rollups) / 60, 1),
+                "daily_scores": [
+                    {
+                        "day": rollup.date,
+                        "avg": rollup.average_score,
+                        "sessions": rollup.session_count,
+                        "minutes": round(rollup.duration_seconds / 60, 1),
+                    }
+                    for rollup in rollups
+                ],
             }
         )
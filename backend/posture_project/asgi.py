@@ -1,20 +1,32 @@
 import os
+import threading
 
-from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.routing import ChannelNameRouter, ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "posture_project.settings")
 
 django_asgi_app = get_asgi_application()
 
+from django.conf import settings  # noqa: E402
+
 from middleware.jwt_websocket import JWTWebSocketMiddleware  # noqa: E402
+from posture.consumers import PoseInferenceConsumer  # noqa: E402
+from posture.inference import get_inference_backend  # noqa: E402
 from posture.routing import websocket_urlpatterns  # noqa: E402
 
+# Load pose models in the background so the first sessions don't pay for it
+threading.Thread(target=get_inference_backend().warm, daemon=True).start()
+
 application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
         "websocket": JWTWebSocketMiddleware(
             URLRouter(websocket_urlpatterns)
         ),
+        # Remote inference workers: manage.py runinferenceworker
+        "channel": ChannelNameRouter({
+            settings.POSE_INFERENCE_CHANNEL: PoseInferenceConsumer.as_asgi(),
+        }),
     }
 )
@@ -0,0 +1,37 @@
+"""
+Version stamps for data cached in-process.
+
+Each named dataset (e.g. "exercise_catalog") has a version kept in the shared
+Django cache. Code that caches the data in memory remembers the version it
+loaded and reloads once ``get_version`` returns something different;
+writers call ``bump`` after changing the data.
+
+Versions are the time of the last change (seconds since the epoch), so they
+double as a last-modified time.
+"""
+
+import time
+
+from django.core.cache import cache
+
+KEY_PREFIX = "cache-version:"
+
+
+def get_version(name):
+    """Return the current version of ``name``, starting one if none is set."""
+    key = KEY_PREFIX + name
+    version = cache.get(key)
+    if version is None:
+        # Unknown (first use or evicted): anything cached may be stale
+        version = time.time()
+        if not cache.add(key, version, timeout=None):
+            # Another process started it first
+            version = cache.get(key, version)
+    return version
+
+
+def bump(name):
+    """Mark ``name`` as changed, invalidating every in-process copy."""
+    version = time.time()
+    cache.set(KEY_PREFIX + name, version, timeout=None)
+    return version
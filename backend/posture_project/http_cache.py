@@ -0,0 +1,79 @@
+"""
+HTTP caching for near-static read endpoints.
+
+A view using CachedResponseMixin names the cache_versions dataset its
+responses are built from. Responses carry an ETag and Last-Modified derived
+from that dataset's version, requests whose If-None-Match matches the ETag
+are answered with 304 without touching the database, and response data is
+cached in the shared cache under the version plus the request's path and
+query parameters, so a write (which bumps the version) invalidates every
+cached page at once.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from . import cache_versions
+
+KEY_PREFIX = "http-response:"
+
+
+class CachedResponseMixin:
+    """
+    Mixin for DRF generic views whose GET responses depend only on the
+    ``cache_version`` dataset and the request URL (not on the user).
+
+    ``cache_control`` is sent on every response; the default lets clients
+    and shared caches keep a copy for HTTP_CACHE_MAX_AGE seconds and then
+    revalidate it with the ETag. Views that require authentication should
+    use "private" so shared caches do not serve them to anonymous clients.
+    """
+
+    cache_version = None
+    cache_control = None
+
+    def get(self, request, *args, **kwargs):
+        version = cache_versions.get_version(self.cache_version)
+        # The renderer is part of the representation (JSON vs browsable API)
+        etag = f'"{self.cache_version}-{version:.6f}-{request.accepted_renderer.format}"'
+        last_modified = int(version)
+
+        # Only the ETag decides 304s: Last-Modified has one-second resolution,
+        # so a client sending just If-Modified-Since would miss a second
+        # change made within the same second
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            response = not_modified
+        else:
+            key = self.get_response_cache_key(request, version)
+            data = cache.get(key)
+            if data is not None:
+                response = Response(data)
+            else:
+                response = super().get(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                cache.set(key, response.data, settings.HTTP_RESPONSE_CACHE_TIMEOUT)
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = self.get_cache_control()
+        return response
+
+    def get_cache_control(self):
+        if self.cache_control is not None:
+            return self.cache_control
+        return f"public, max-age={settings.HTTP_CACHE_MAX_AGE}"
+
+    def get_response_cache_key(self, request, version):
+        # Host is included because pagination links are absolute URLs
+        query = sorted(request.query_params.lists())
+        raw = repr((request.get_host(), request.path, query, request.accepted_renderer.format))
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return f"{KEY_PREFIX}{self.cache_version}:{version:.6f}:{digest}"
+
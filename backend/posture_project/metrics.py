@@ -0,0 +1,68 @@
+"""
+Lightweight in-process metrics registry.
+
+Counters, gauges and timers are kept in memory per process and exposed
+as JSON by the ``/metrics`` endpoint. This is intentionally minimal — it
+only needs to answer "how busy is this node right now".
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_timers = {}
+
+
+def incr(name, amount=1):
+    """Increment a monotonically increasing counter."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def set_gauge(name, value):
+    """Set a gauge to an absolute value."""
+    with _lock:
+        _gauges[name] = value
+
+
+def observe(name, seconds):
+    """Record a duration sample (in seconds) for a timer."""
+    with _lock:
+        timer = _timers.get(name)
+        if timer is None:
+            timer = _timers[name] = {"count": 0, "sum": 0.0, "max": 0.0}
+        timer["count"] += 1
+        timer["sum"] += seconds
+        if seconds > timer["max"]:
+            timer["max"] = seconds
+
+
+@contextmanager
+def timed(name):
+    """Context manager that records the elapsed time of its block."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def snapshot():
+    """Return a JSON-serializable copy of all metrics."""
+    with _lock:
+        timers = {}
+        for name, timer in _timers.items():
+            count = timer["count"]
+            timers[name] = {
+                "count": count,
+                "avg_ms": round(timer["sum"] / count * 1000, 3) if count else 0.0,
+                "max_ms": round(timer["max"] * 1000, 3),
+            }
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "timers": timers,
+        }
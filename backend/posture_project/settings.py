@@ -75,17 +75,135 @@ DATABASES = {
     )
 }
 
-# Channel layers (Redis)
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels_redis.core.RedisChannelLayer",
-        "CONFIG": {
-            "hosts": [
-                os.environ.get("REDIS_URL", "redis://localhost:6379/0")
-            ],
+# Channel layers (Redis). CHANNEL_LAYER=memory swaps in the in-process layer
+# for local development and tests; it cannot reach separate runworker
+# processes, so remote inference then has to run in the same process.
+if os.environ.get("CHANNEL_LAYER", "redis") == "memory":
+    CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"},
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": [
+                    os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+                ],
+            },
         },
-    },
-}
+    }
+
+# Shared cache (Redis when REDIS_URL is set). Besides cached data it holds the
+# version stamps in posture_project.cache_versions, so in-process caches on
+# every node notice invalidations; with the local-memory fallback they are
+# only invalidated within the process that made the change.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        },
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+
+# HTTP caching of near-static endpoints (exercise catalog, plans; see
+# posture_project.http_cache). Public responses may be reused by clients and
+# CDNs for HTTP_CACHE_MAX_AGE seconds before revalidating with their ETag.
+# Response data is cached server-side per version stamp, so the timeout only
+# bounds how long superseded entries linger.
+HTTP_CACHE_MAX_AGE = int(os.environ.get("HTTP_CACHE_MAX_AGE", "300"))
+HTTP_RESPONSE_CACHE_TIMEOUT = int(os.environ.get("HTTP_RESPONSE_CACHE_TIMEOUT", "3600"))
+
+# /metrics (posture_project.metrics) is only served to staff users logged in
+# to the admin, or to scrapers sending "Authorization: Bearer <METRICS_TOKEN>"
+# (unset = staff only).
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Pose detection
+# Shared pool of MediaPipe detectors per process. Sessions borrow a detector
+# per frame ("frame") or hold one for the whole session ("session").
+POSE_DETECTOR_POOL_SIZE = int(os.environ.get("POSE_DETECTOR_POOL_SIZE", "4"))
+POSE_DETECTOR_POOL_WARM = int(os.environ.get("POSE_DETECTOR_POOL_WARM", "1"))
+POSE_DETECTOR_ACQUIRE_TIMEOUT = float(os.environ.get("POSE_DETECTOR_ACQUIRE_TIMEOUT", "2.0"))
+POSE_DETECTOR_MAX_FRAMES = int(os.environ.get("POSE_DETECTOR_MAX_FRAMES", "100000"))
+POSE_DETECTOR_CHECKOUT = os.environ.get("POSE_DETECTOR_CHECKOUT", "frame")
+# MediaPipe running mode for the thread backend: "image" runs person
+# detection on every frame; "video" gives each session its own tracking
+# detector (implying "session" checkout) that only re-detects when it loses
+# the pose. Tracking detectors come from a separate pool of
+# POSE_VIDEO_DETECTOR_POOL_SIZE, which caps the number of concurrent VIDEO
+# sessions per process: further sessions are told the server is busy.
+POSE_RUNNING_MODE = os.environ.get("POSE_RUNNING_MODE", "image")
+POSE_VIDEO_DETECTOR_POOL_SIZE = int(os.environ.get("POSE_VIDEO_DETECTOR_POOL_SIZE", "16"))
+
+# Frame preprocessing before detection (posture.landmark_utils.detect_pose).
+# IMAGE-mode detection looks only at the region around the previous frame's
+# posture landmarks, padded by POSE_ROI_PADDING of its longer side (0 turns
+# this off) and scaled down to POSE_ROI_SIZE pixels; when that misses, the
+# full frame is used, scaled down to POSE_MAX_FRAME_SIDE (0 = as sent).
+POSE_ROI_PADDING = float(os.environ.get("POSE_ROI_PADDING", "0.35"))
+POSE_ROI_SIZE = int(os.environ.get("POSE_ROI_SIZE", "256"))
+POSE_MAX_FRAME_SIDE = int(os.environ.get("POSE_MAX_FRAME_SIDE", "640"))
+
+# Where decode + pose detection run: "thread" (default thread executor and
+# the detector pool above), "process" (worker processes fed through shared
+# memory; POSE_INFERENCE_WORKERS=0 means one per CPU) or "channels" (remote
+# workers started with `manage.py runinferenceworker`).
+POSE_INFERENCE_BACKEND = os.environ.get("POSE_INFERENCE_BACKEND", "thread")
+POSE_INFERENCE_WORKERS = int(os.environ.get("POSE_INFERENCE_WORKERS", "0"))
+POSE_INFERENCE_SLOT_BYTES = int(os.environ.get("POSE_INFERENCE_SLOT_BYTES", str(2 * 1024 * 1024)))
+POSE_INFERENCE_CHANNEL = os.environ.get("POSE_INFERENCE_CHANNEL", "posture-inference")
+POSE_INFERENCE_TIMEOUT = float(os.environ.get("POSE_INFERENCE_TIMEOUT", "2.0"))
+
+# Per-connection frame scheduling. Frames are analysed at most
+# POSTURE_TARGET_FPS times per second (0 = unthrottled); a newer frame
+# replaces the pending one in the single-slot mailbox, and frames that
+# waited longer than POSTURE_FRAME_DEADLINE_MS (0 = no deadline) are
+# dropped unprocessed.
+POSTURE_TARGET_FPS = float(os.environ.get("POSTURE_TARGET_FPS", "15"))
+POSTURE_FRAME_DEADLINE_MS = int(os.environ.get("POSTURE_FRAME_DEADLINE_MS", "500"))
+
+# Server-driven capture rate (posture.rate_control). Every
+# POSTURE_RATE_CONTROL_INTERVAL seconds each session steps its advertised
+# fps / JPEG quality / width down when its frames take longer than
+# POSTURE_RATE_TARGET_LATENCY_MS from arrival to result, frames are dropped,
+# or node utilization (frames in inference per detector / worker) is above
+# POSTURE_NODE_HIGH_LOAD; it steps back up once things are calm and
+# utilization is below POSTURE_NODE_LOW_LOAD.
+POSTURE_RATE_CONTROL = os.environ.get("POSTURE_RATE_CONTROL", "True").lower() in ("true", "1")
+POSTURE_RATE_TARGET_LATENCY_MS = float(os.environ.get("POSTURE_RATE_TARGET_LATENCY_MS", "250"))
+POSTURE_RATE_CONTROL_INTERVAL = float(os.environ.get("POSTURE_RATE_CONTROL_INTERVAL", "2.0"))
+POSTURE_NODE_HIGH_LOAD = float(os.environ.get("POSTURE_NODE_HIGH_LOAD", "0.9"))
+POSTURE_NODE_LOW_LOAD = float(os.environ.get("POSTURE_NODE_LOW_LOAD", "0.6"))
+
+# Scene-change gating (posture.scene_change). While scoring, a frame whose
+# 1/8-scale grayscale thumbnail has less than POSTURE_SCENE_CHANGE_THRESHOLD
+# of its pixels changed since the last inferred frame reuses that frame's
+# landmarks and score (0 = infer every frame). Inference still runs at least
+# every POSTURE_SCENE_REFRESH_SECONDS.
+POSTURE_SCENE_CHANGE_THRESHOLD = float(os.environ.get("POSTURE_SCENE_CHANGE_THRESHOLD", "0.01"))
+POSTURE_SCENE_REFRESH_SECONDS = float(os.environ.get("POSTURE_SCENE_REFRESH_SECONDS", "1.0"))
+
+# Write-behind buffer for PostureScore rows: flushed with bulk_create every
+# POSTURE_SCORE_FLUSH_INTERVAL seconds or POSTURE_SCORE_FLUSH_ROWS rows, and
+# capped at POSTURE_SCORE_BUFFER_MAX_ROWS pending rows per process.
+POSTURE_SCORE_BUFFER_MAX_ROWS = int(os.environ.get("POSTURE_SCORE_BUFFER_MAX_ROWS", "10000"))
+POSTURE_SCORE_FLUSH_ROWS = int(os.environ.get("POSTURE_SCORE_FLUSH_ROWS", "500"))
+POSTURE_SCORE_FLUSH_INTERVAL = float(os.environ.get("POSTURE_SCORE_FLUSH_INTERVAL", "1.0"))
+
+# How session scores are stored: "rows" (one PostureScore per sample) or
+# "series" (one packed PostureSeries per session, with min/mean/max rollups
+# over each POSTURE_SERIES_ROLLUPS bucket size in seconds).
+POSTURE_SCORE_STORAGE = os.environ.get("POSTURE_SCORE_STORAGE", "rows")
+POSTURE_SERIES_ROLLUPS = [
+    int(seconds)
+    for seconds in os.environ.get("POSTURE_SERIES_ROLLUPS", "10,60").split(",")
+    if seconds.strip()
+]
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -142,6 +260,13 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# WebSocket JWT auth (middleware.jwt_websocket). Users are cached per process
+# by id for WS_AUTH_CACHE_TTL seconds (0 disables), so reconnect storms do
+# not each cost a user query; changes made by other processes are seen once
+# the entry expires.
+WS_AUTH_CACHE_SIZE = int(os.environ.get("WS_AUTH_CACHE_SIZE", "10000"))
+WS_AUTH_CACHE_TTL = float(os.environ.get("WS_AUTH_CACHE_TTL", "60"))
+
 # CORS
 CORS_ALLOWED_ORIGINS = os.environ.get(
     "CORS_ALLOWED_ORIGINS",
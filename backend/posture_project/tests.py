@@ -0,0 +1,28 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+
+@override_settings(METRICS_TOKEN="scrape-me")
+class MetricsViewTests(TestCase):
+    def test_anonymous_requests_are_refused(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 403)
+
+    def test_metrics_token(self):
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-me")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("counters", response.json())
+
+    def test_staff_only(self):
+        user = User.objects.create_user("ops", password="pw")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        user.is_staff = True
+        user.save()
+        self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_no_token_configured(self):
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer ")
+        self.assertEqual(response.status_code, 403)
@@ -1,14 +1,38 @@
+import hmac
+
+from django.conf import settings
 from django.contrib import admin
 from django.http import JsonResponse
 from django.urls import include, path
 
+from . import metrics
+
 
 def healthcheck(request):
     return JsonResponse({"status": "ok"})
 
 
+def metrics_allowed(request):
+    """Staff sessions, or a bearer token matching METRICS_TOKEN."""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return bool(
+        settings.METRICS_TOKEN
+        and scheme.lower() == "bearer"
+        and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode())
+    )
+
+
+def metrics_view(request):
+    if not metrics_allowed(request):
+        return JsonResponse({"detail": "Not authorized."}, status=403)
+    return JsonResponse(metrics.snapshot())
+
+
 urlpatterns = [
     path("healthz", healthcheck),
+    path("metrics", metrics_view),
     path("admin/", admin.site.urls),
     path("api/auth/", include("accounts.urls")),
     path("api/posture/", include("posture.urls")),
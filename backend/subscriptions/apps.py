@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class SubscriptionsConfig(AppConfig):
+    name = "subscriptions"
+
+    def ready(self):
+        from .models import SubscriptionPlan
+        from .signals import invalidate_plans
+
+        uid = "subscription-plans"
+        post_save.connect(invalidate_plans, sender=SubscriptionPlan, dispatch_uid=uid)
+        post_delete.connect(invalidate_plans, sender=SubscriptionPlan, dispatch_uid=uid)
@@ -0,0 +1,15 @@
+"""
+Cache invalidation for subscription plans.
+
+PlanListView responses are cached under the PLANS_VERSION stamp in
+posture_project.cache_versions; plan saves and deletes bump it (see apps.py).
+"""
+
+from posture_project import cache_versions
+
+PLANS_VERSION = "subscription_plans"
+
+
+def invalidate_plans(**kwargs):
+    """Signal receiver: the plans changed, so cached responses are stale."""
+    cache_versions.bump(PLANS_VERSION)
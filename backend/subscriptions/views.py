@@ -2,11 +2,15 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from posture_project.http_cache import CachedResponseMixin
+
 from .models import SubscriptionPlan
 from .serializers import SubscriptionPlanSerializer
+from .signals import PLANS_VERSION
 
 
-class PlanListView(generics.ListAPIView):
+class PlanListView(CachedResponseMixin, generics.ListAPIView):
+    cache_version = PLANS_VERSION
     serializer_class = SubscriptionPlanSerializer
     permission_classes = [permissions.AllowAny]
     queryset = SubscriptionPlan.objects.filter(is_active=True)
@@ -1,8 +1,12 @@
 import { ref, onUnmounted } from 'vue'
 
+// Offered at connect; when the server accepts it, frames go as binary JPEG
+const BINARY_SUBPROTOCOL = 'posture.binary.v1'
+
 export function usePostureSocket() {
   const ws = ref(null)
   const connected = ref(false)
+  const binaryFrames = ref(false)
   const sessionId = ref(null)
   const calibrating = ref(false)
   const calibrationProgress = ref(0)
@@ -10,8 +14,13 @@ export function usePostureSocket() {
   const idealLandmarks = ref(null)
   const sessionSummary = ref(null)
   const error = ref(null)
+  // Capture settings requested by the server: { fps, jpeg_quality, max_width, reason }
+  const rateControl = ref(null)
 
   let frameInterval = null
+  let frameCapture = null
+  let frameFps = 15
+  let loopFps = null
 
   function connect() {
     const token = localStorage.getItem('access_token')
@@ -24,10 +33,11 @@ export function usePostureSocket() {
     const host = import.meta.env.VITE_WS_URL || 'localhost:8000'
     const url = `${protocol}//${host}/ws/posture/analyze/?token=${token}`
 
-    ws.value = new WebSocket(url)
+    ws.value = new WebSocket(url, [BINARY_SUBPROTOCOL])
 
     ws.value.onopen = () => {
       connected.value = true
+      binaryFrames.value = ws.value.protocol === BINARY_SUBPROTOCOL
       error.value = null
     }
 
@@ -52,6 +62,9 @@ export function usePostureSocket() {
     switch (data.type) {
       case 'session_started':
         sessionId.value = data.session_id
+        if (data.ideal_landmarks) {
+          idealLandmarks.value = data.ideal_landmarks
+        }
         break
       case 'calibration_started':
         calibrating.value = true
@@ -74,6 +87,13 @@ export function usePostureSocket() {
           idealLandmarks.value = data.ideal_landmarks
         }
         break
+      case 'rate_control':
+        rateControl.value = data
+        // Restart the running loop at the new rate
+        if (frameInterval && data.fps !== loopFps) {
+          startFrameLoop(frameCapture, frameFps)
+        }
+        break
       case 'session_ended':
         sessionSummary.value = data.summary
         break
@@ -89,31 +109,42 @@ export function usePostureSocket() {
     }
   }
 
-  function startSession() {
-    send({ action: 'start_session' })
+  function startSession({ reuseCalibration = false } = {}) {
+    send({ action: 'start_session', reuse_calibration: reuseCalibration })
   }
 
   function startCalibration() {
     send({ action: 'calibrate' })
   }
 
-  function sendFrame(base64Frame) {
-    send({ action: 'frame', frame: base64Frame })
+  function sendFrame(frame) {
+    if (typeof frame === 'string') {
+      send({ action: 'frame', frame })
+    } else if (ws.value && ws.value.readyState === WebSocket.OPEN) {
+      ws.value.send(frame)
+    }
   }
 
   function endSession() {
     send({ action: 'end_session' })
   }
 
+  // fps is the most the caller wants to send; the server may ask for less
   function startFrameLoop(captureFunc, fps = 15) {
     stopFrameLoop()
-    const interval = 1000 / fps
-    frameInterval = setInterval(() => {
-      const frame = captureFunc()
+    frameCapture = captureFunc
+    frameFps = fps
+    loopFps = Math.min(fps, rateControl.value?.fps ?? fps)
+    frameInterval = setInterval(async () => {
+      const options = {
+        quality: rateControl.value?.jpeg_quality,
+        maxWidth: rateControl.value?.max_width,
+      }
+      const frame = await captureFunc(binaryFrames.value, options)
       if (frame) {
         sendFrame(frame)
       }
-    }, interval)
+    }, 1000 / loopFps)
   }
 
   function stopFrameLoop() {
@@ -130,17 +161,20 @@ export function usePostureSocket() {
       ws.value = null
     }
     connected.value = false
+    binaryFrames.value = false
     sessionId.value = null
     calibrating.value = false
     latestResult.value = null
     idealLandmarks.value = null
     sessionSummary.value = null
+    rateControl.value = null
   }
 
   onUnmounted(disconnect)
 
   return {
     connected,
+    binaryFrames,
     sessionId,
     calibrating,
     calibrationProgress,
@@ -148,6 +182,7 @@ export function usePostureSocket() {
     idealLandmarks,
     sessionSummary,
     error,
+    rateControl,
     connect,
     startSession,
     startCalibration,
@@ -33,18 +33,32 @@ export function useWebcam() {
     isActive.value = false
   }
 
-  function captureFrame(videoEl) {
-    if (!videoEl || videoEl.readyState < 2) return null
+  // Draw the current video frame, scaled down to at most maxWidth pixels wide
+  function drawFrame(videoEl, maxWidth) {
+    const scale = maxWidth ? Math.min(1, maxWidth / videoEl.videoWidth) : 1
     const canvas = document.createElement('canvas')
-    canvas.width = videoEl.videoWidth
-    canvas.height = videoEl.videoHeight
+    canvas.width = Math.round(videoEl.videoWidth * scale)
+    canvas.height = Math.round(videoEl.videoHeight * scale)
     const ctx = canvas.getContext('2d')
-    ctx.drawImage(videoEl, 0, 0)
+    ctx.drawImage(videoEl, 0, 0, canvas.width, canvas.height)
+    return canvas
+  }
+
+  function captureFrame(videoEl, { quality = 0.7, maxWidth } = {}) {
+    if (!videoEl || videoEl.readyState < 2) return null
+    const canvas = drawFrame(videoEl, maxWidth)
     // Return base64 JPEG without the data URI prefix
-    return canvas.toDataURL('image/jpeg', 0.7).split(',')[1]
+    return canvas.toDataURL('image/jpeg', quality).split(',')[1]
+  }
+
+  function captureFrameBlob(videoEl, { quality = 0.7, maxWidth } = {}) {
+    if (!videoEl || videoEl.readyState < 2) return Promise.resolve(null)
+    const canvas = drawFrame(videoEl, maxWidth)
+    // Raw JPEG bytes for the binary WebSocket protocol
+    return new Promise((resolve) => canvas.toBlob(resolve, 'image/jpeg', quality))
   }
 
   onUnmounted(stop)
 
-  return { videoRef, stream, isActive, error, start, stop, captureFrame }
+  return { videoRef, stream, isActive, error, start, stop, captureFrame, captureFrameBlob }
 }